@@ -1,18 +1,20 @@
 
 import customtkinter
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk, ImageDraw
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import Image as ReportLabImage
-from reportlab.lib.utils import ImageReader
-from reportlab.platypus import Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 import threading
 import os
-import re
-import tempfile
+import traceback
+from contextlib import contextmanager
+
+import discovery
+import project
+import resources
+import tracing
+from course_sync import CourseSync
+from file_cache import source_cache
+from jobs import JobScheduler
+from search_index import TaskIndexer
+from thumbnails import ThumbnailLoader
 
 # Modern dark mode with blue as the primary color
 customtkinter.set_appearance_mode("dark")
@@ -24,24 +26,34 @@ HEADING_FONT = (FONT_FAMILY, 16, "bold")
 LABEL_FONT = (FONT_FAMILY, 12)
 BUTTON_FONT = (FONT_FAMILY, 12, "bold")
 ENTRY_FONT = (FONT_FAMILY, 12)
-
-def create_empty_image():
-    """Create a small black rectangle image as placeholder"""
-    img = Image.new('RGB', (100, 100), color='black')
-    draw = ImageDraw.Draw(img)
-    draw.rectangle([10, 10, 90, 90], outline='white', width=2)
-    draw.text((50, 50), "No Image", fill='white', anchor='mm')
-    return img
+JOB_POLL_MS = 100
+WATCH_MS = 3000
+SEARCH_DELAY_MS = 150  # Typing pause before the search runs
+SEARCH_RETRY_MS = 500  # Re-run a search while the index is still catching up
+MAX_SEARCH_RESULTS = 8
+
+def new_task_record(task="", solution_file="", image_path=None):
+    """Plain data for one task; LevelFrame keeps a list of these instead of widgets"""
+    return {"task": task, "solution_file": solution_file, "image_path": image_path}
+
+def set_entry_text(entry, text):
+    """Replace an entry's text, leaving its placeholder visible when text is empty"""
+    entry.delete(0, customtkinter.END)
+    if text:
+        entry.insert(0, text)
 
 class TaskEntry(customtkinter.CTkFrame):
-    def __init__(self, master, delete_callback):
+    """Editor for one task record. Each LevelFrame owns a single TaskEntry and re-binds it
+    to whichever task is selected, so the widget count doesn't grow with the task count."""
+
+    def __init__(self, master, delete_callback, thumbnail_loader, change_callback=None):
         super().__init__(master)
         self.delete_callback = delete_callback
+        self.change_callback = change_callback  # Called with the record when its question or file changes
+        self.thumbnail_loader = thumbnail_loader
         self.folder_path = ""  # To store the folder path from the level
-        self.empty_image = create_empty_image()  # Store the empty image placeholder
-        self.placeholder_path = os.path.join(tempfile.gettempdir(), "placeholder.png")
-        self.empty_image.save(self.placeholder_path)
-        
+        self.record = None  # Task record currently shown
+
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=0)  # For delete button
 
@@ -61,10 +73,10 @@ class TaskEntry(customtkinter.CTkFrame):
         self.image_button = customtkinter.CTkButton(self, text="Choose Image", command=self.choose_image, font=BUTTON_FONT)
         self.image_button.grid(row=4, column=0, padx=15, pady=(5, 5), sticky="ew")
 
-        self.image_path = self.placeholder_path  # Default to placeholder
+        self.image_path = None  # None means the shared placeholder
         self.image_preview_label = customtkinter.CTkLabel(self, text="", width=100, height=100)
         self.image_preview_label.grid(row=5, column=0, padx=15, pady=(5, 10), sticky="ew")
-        self.display_image_preview(self.placeholder_path)  # Show placeholder initially
+        self.display_image_preview(None)  # Show placeholder initially
 
         # Code display section
         self.code_label = customtkinter.CTkLabel(self, text="Code Preview:", anchor="w", font=LABEL_FONT)
@@ -72,38 +84,63 @@ class TaskEntry(customtkinter.CTkFrame):
 
         self.code_textbox = customtkinter.CTkTextbox(self, height=100, font=("Courier", 12))
         self.code_textbox.grid(row=7, column=0, padx=15, pady=(5, 10), sticky="ew")
-        self.code_textbox.insert("0.0", "Code will appear here when solution file is specified")
-        self.code_textbox.configure(state="disabled")
+        self.set_code_text("Code will appear here when solution file is specified")
 
         self.delete_task_button = customtkinter.CTkButton(self, text="Delete Task", command=self.delete_self, fg_color="#cc0000", hover_color="#aa0000", font=BUTTON_FONT)
         self.delete_task_button.grid(row=0, column=1, padx=5, pady=5, sticky="ne")
 
+    def bind_record(self, record, folder_path):
+        """Show record in the editor, saving edits to the previously shown record first"""
+        self.commit()
+        self.record = record
+        self.folder_path = folder_path
+        set_entry_text(self.task_entry, record["task"])
+        set_entry_text(self.solution_entry, record["solution_file"])
+        self.image_path = record["image_path"]
+        self.display_image_preview(self.image_path)
+        self.set_code_text("Code will appear here when solution file is specified")
+        self.load_code_from_file()
+
+    def unbind_record(self):
+        self.commit()
+        self.record = None
+
+    def commit(self):
+        """Write the editor's fields back into the bound record"""
+        if self.record is not None:
+            task, solution_file = self.task_entry.get(), self.solution_entry.get()
+            changed = (task, solution_file) != (self.record["task"], self.record["solution_file"])
+            self.record["task"] = task
+            self.record["solution_file"] = solution_file
+            self.record["image_path"] = self.image_path
+            if changed and self.change_callback:
+                self.change_callback(self.record)
+
     def set_folder_path(self, folder_path):
         """Set the folder path for this task (called from LevelFrame)"""
         self.folder_path = folder_path
         self.load_code_from_file()
 
+    def set_code_text(self, text):
+        self.code_textbox.configure(state="normal")
+        self.code_textbox.delete("0.0", "end")
+        self.code_textbox.insert("0.0", text)
+        self.code_textbox.configure(state="disabled")
+
     def load_code_from_file(self, event=None):
         """Load code from the specified solution file"""
+        self.commit()
         if not self.folder_path or not self.solution_entry.get():
             return
-            
+
         solution_file = os.path.join(self.folder_path, self.solution_entry.get())
-        
+
         try:
-            with open(solution_file, 'r', encoding='utf-8') as file:
-                code_content = file.read()
-                
-            self.code_textbox.configure(state="normal")
-            self.code_textbox.delete("0.0", "end")
-            self.code_textbox.insert("0.0", code_content)
-            self.code_textbox.configure(state="disabled")
-            
+            # Cached by (path, mtime, size); huge files are cut to a preview
+            with tracing.span("load_code"):
+                self.set_code_text(source_cache.get_preview(solution_file))
         except Exception as e:
-            self.code_textbox.configure(state="normal")
-            self.code_textbox.delete("0.0", "end")
-            self.code_textbox.insert("0.0", f"Error loading code: {str(e)}")
-            self.code_textbox.configure(state="disabled")
+            self.set_code_text(f"Error loading code: {str(e)}")
 
     def choose_image(self):
         file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.gif")])
@@ -112,56 +149,40 @@ class TaskEntry(customtkinter.CTkFrame):
             self.display_image_preview(file_path)
         else:
             # Use placeholder if no image selected
-            self.image_path = self.placeholder_path
-            self.display_image_preview(self.placeholder_path)
+            self.image_path = None
+            self.display_image_preview(None)
+        self.commit()
 
     def display_image_preview(self, image_path):
-        try:
-            if image_path == self.placeholder_path:
-                img = self.empty_image
-            else:
-                img = Image.open(image_path)
-            img = img.resize((100, 100))
-            photo = ImageTk.PhotoImage(img)
-            self.image_preview_label.configure(image=photo, text="")
-            self.image_preview_label.image = photo
-        except Exception as e:
+        # The placeholder shows until the thumbnail arrives from the loader's worker pool
+        photo = resources.placeholder_photo()  # Shared, built once per process
+        self.image_preview_label.configure(image=photo, text="")
+        self.image_preview_label.image = photo
+        if image_path is not None:
+            self.thumbnail_loader.request(image_path, self.on_thumbnail_loaded)
+
+    def on_thumbnail_loaded(self, image_path, photo, error):
+        if image_path != self.image_path:
+            return  # The view was re-bound to another task meanwhile
+        if error is not None:
             self.image_preview_label.configure(text="Error loading image")
-            print(f"Error loading image: {e}")
-            self.image_path = self.placeholder_path
-
-    def get_task_data(self):
-        """Get the code content from the textbox"""
-        code_content = self.code_textbox.get("0.0", "end").strip()
-        if code_content.startswith("Error") or code_content.startswith("Code will appear"):
-            code_content = ""  # Don't include placeholder or error text
-            
-        return {
-            "task": self.task_entry.get(),
-            "solution_file": self.solution_entry.get(),
-            "image_path": self.image_path if self.image_path != self.placeholder_path else None,
-            "code_snippet": code_content
-        }
-
-    def clear_task_data(self):
-        self.task_entry.delete('0', customtkinter.END)
-        self.solution_entry.delete('0', customtkinter.END)
-        self.image_path = self.placeholder_path
-        self.display_image_preview(self.placeholder_path)
-        self.code_textbox.configure(state="normal")
-        self.code_textbox.delete("0.0", "end")
-        self.code_textbox.insert("0.0", "Code will appear here when solution file is specified")
-        self.code_textbox.configure(state="disabled")
+            print(f"Error loading image: {error}")
+            self.image_path = None
+            self.commit()
+            return
+        self.image_preview_label.configure(image=photo, text="")
+        self.image_preview_label.image = photo
 
     def delete_self(self):
-        if self.delete_callback:
-            self.delete_callback(self)
+        if self.delete_callback and self.record is not None:
+            self.delete_callback(self.record)
 
 class LevelFrame(customtkinter.CTkFrame):
-    def __init__(self, master, level_number, delete_callback):
+    def __init__(self, master, level_number, delete_callback, thumbnail_loader, default_task=True, change_callback=None):
         super().__init__(master)
         self.level_number = level_number
         self.delete_callback = delete_callback
+        self.change_callback = change_callback  # Called with (level, changed records or None for all of them)
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
@@ -206,10 +227,15 @@ class LevelFrame(customtkinter.CTkFrame):
         self.tasks_frame.grid(row=5, column=0, columnspan=4, padx=15, pady=(0, 10), sticky="ew")
         self.tasks_frame.grid_columnconfigure(0, weight=1)
 
-        self.task_entries = []
-        self.add_task() # Add a default task
+        # Tasks are plain records; a single TaskEntry view shows the selected one
+        self.tasks = []
         self.current_task_index = 0
-        self.update_task_display(1)
+        self.task_view = TaskEntry(self.tasks_frame, self.remove_task, thumbnail_loader,
+                                   lambda record: self.notify_change([record]))
+        if default_task:
+            self.add_task() # Add a default task
+        else:
+            self.show_task(0)  # Imports fill the tasks in right after
 
         self.add_task_button = customtkinter.CTkButton(self, text="Add Task", command=self.add_task, font=BUTTON_FONT)
         self.add_task_button.grid(row=6, column=0, columnspan=4, padx=10, pady=(5, 10), sticky="ew")
@@ -222,253 +248,128 @@ class LevelFrame(customtkinter.CTkFrame):
         if folder_selected:
             self.folder_entry.delete(0, customtkinter.END)
             self.folder_entry.insert(0, folder_selected)
-            # Update all tasks with the new folder path
-            for task in self.task_entries:
-                task.set_folder_path(folder_selected)
-
-    def add_task(self):
-        task_entry = TaskEntry(self.tasks_frame, self.remove_task)
-        self.task_entries.append(task_entry)
-        self.update_tasks_ui()
-        self.task_slider.configure(to=len(self.task_entries), number_of_steps=len(self.task_entries))
-        self.current_task_index = len(self.task_entries) - 1
-        self.update_task_display(len(self.task_entries))
-        
-        # Set the folder path if it's already specified
-        if self.folder_entry.get():
-            task_entry.set_folder_path(self.folder_entry.get())
+            # Only the visible task needs its code reloaded
+            self.task_view.set_folder_path(folder_selected)
+            self.notify_change()
+
+    def notify_change(self, records=None):
+        """Tell the owner (the search index) that records, or every task if None, changed"""
+        if self.change_callback:
+            self.change_callback(self, records)
+
+    def add_task(self, record=None):
+        self.tasks.append(record or new_task_record())
+        self.update_task_slider()
+        self.show_task(len(self.tasks) - 1)
+        self.notify_change([self.tasks[-1]])
+
+    def set_tasks(self, records):
+        """Replace every task of this level with records"""
+        self.task_view.unbind_record()
+        self.tasks = list(records)
+        self.update_task_slider()
+        self.show_task(0)
+        self.notify_change()
+
+    def load_scan(self, level_data):
+        """Fill this level from a scanned Day folder"""
+        set_entry_text(self.level_name_entry, level_data["level_name"])
+        set_entry_text(self.folder_entry, level_data["folder"])
+        # One task record per .py file, replacing the default task
+        self.set_tasks([
+            new_task_record(task_data["task"], task_data["solution_file"], task_data["image_path"])
+            for task_data in level_data["tasks"]
+        ])
+
+    def merge_scan(self, old_level, new_level):
+        """Apply a re-scan of this level's folder, keeping manual edits
+
+        Tasks are matched by solution file. Tasks whose file was deleted are dropped, new
+        files get new tasks, and a field is only refreshed if it still holds the value
+        the previous scan put there.
+        """
+        self.task_view.commit()
+        if self.level_name_entry.get() == old_level["level_name"]:
+            set_entry_text(self.level_name_entry, new_level["level_name"])
+
+        old_tasks = {task["solution_file"]: task for task in old_level["tasks"]}
+        new_tasks = {task["solution_file"]: task for task in new_level["tasks"]}
+        kept = []
+        for record in self.tasks:
+            name = record["solution_file"]
+            if name in old_tasks and name not in new_tasks:
+                continue  # Solution file deleted
+            scanned = new_tasks.get(name)
+            if scanned is not None:
+                previous = old_tasks.get(name)
+                for field in ("task", "image_path"):
+                    unedited = record[field] == previous[field] if previous else not record[field]
+                    if unedited:
+                        record[field] = scanned[field]
+            kept.append(record)
+        present = {record["solution_file"] for record in kept}
+        for scanned in new_level["tasks"]:
+            if scanned["solution_file"] not in present:
+                kept.append(new_task_record(scanned["task"], scanned["solution_file"], scanned["image_path"]))
+
+        current = self.tasks[self.current_task_index] if self.tasks else None
+        index = next((k for k, record in enumerate(kept) if record is current), min(self.current_task_index, len(kept) - 1))
+        self.task_view.unbind_record()
+        self.tasks = kept
+        self.update_task_slider()
+        self.show_task(max(0, index))  # Rebinding reloads the visible task's code and preview
+        self.notify_change()  # Re-scanned files may have new code even where the records didn't change
 
     def remove_task(self, task_to_remove):
-        if task_to_remove in self.task_entries:
-            task_index = self.task_entries.index(task_to_remove)
-            task_to_remove.destroy()
-            self.task_entries.remove(task_to_remove)
-            self.update_tasks_ui()
-            self.task_slider.configure(to=len(self.task_entries), number_of_steps=len(self.task_entries))
-            if self.task_entries:
-                self.current_task_index = min(self.current_task_index, len(self.task_entries) - 1)
-                self.update_task_display(self.current_task_index + 1)
-            else:
-                self.current_task_index = 0
-                self.update_task_display(0)
-
-    def update_tasks_ui(self):
-        for i, task_entry in enumerate(self.task_entries):
-            task_entry.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="nsew")
-            self.tasks_frame.grid_columnconfigure(0, weight=1)
-        self.tasks_frame.update_idletasks()
+        if task_to_remove in self.tasks:
+            self.task_view.unbind_record()
+            self.tasks.remove(task_to_remove)
+            self.update_task_slider()
+            self.show_task(min(self.current_task_index, len(self.tasks) - 1))
+            self.notify_change()
+
+    def update_task_slider(self):
+        self.task_slider.configure(to=max(1, len(self.tasks)), number_of_steps=max(1, len(self.tasks)))
+
+    def show_task(self, index):
+        """Select task index, keeping the slider in sync"""
+        if self.tasks:
+            self.task_slider.set(index + 1)
+        self.update_task_display(index + 1)
 
     def update_task_display(self, task_number):
-        if self.task_entries:
-            self.current_task_index = int(task_number) - 1
-            for i, task_entry in enumerate(self.task_entries):
-                if i == self.current_task_index:
-                    task_entry.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="ew")
-                else:
-                    task_entry.grid_forget()
-            self.task_label.configure(text=f"Task {self.current_task_index + 1} of {len(self.task_entries)}")
+        if self.tasks:
+            self.current_task_index = min(max(int(task_number), 1), len(self.tasks)) - 1
+            self.task_view.bind_record(self.tasks[self.current_task_index], self.folder_entry.get())
+            self.task_view.grid(row=0, column=0, padx=10, pady=(5, 0), sticky="ew")
+            self.task_label.configure(text=f"Task {self.current_task_index + 1} of {len(self.tasks)}")
         else:
+            self.current_task_index = 0
+            self.task_view.unbind_record()
+            self.task_view.grid_forget()
             self.task_label.configure(text="No tasks added")
 
     def prev_task(self):
-        if self.task_entries:
-            self.current_task_index = max(0, self.current_task_index - 1)
-            self.task_slider.set(self.current_task_index + 1)
-            self.update_task_display(self.current_task_index + 1)
+        if self.tasks:
+            self.show_task(max(0, self.current_task_index - 1))
 
     def next_task(self):
-        if self.task_entries:
-            self.current_task_index = min(len(self.task_entries) - 1, self.current_task_index + 1)
-            self.task_slider.set(self.current_task_index + 1)
-            self.update_task_display(self.current_task_index + 1)
+        if self.tasks:
+            self.show_task(min(len(self.tasks) - 1, self.current_task_index + 1))
 
     def get_level_data(self):
-        tasks_data = [task.get_task_data() for task in self.task_entries]
+        """Level data for the report; code is read by the report worker, not here"""
+        self.task_view.commit()
         return {
             "level_name": self.level_name_entry.get(),
             "folder": self.folder_entry.get(),
-            "tasks": tasks_data
+            "tasks": [dict(record) for record in self.tasks]
         }
 
     def delete_self(self):
         if self.delete_callback:
             self.delete_callback(self)
 
-def generate_pdf_report(report_data, progress_bar, app, save_path):
-    try:
-        os.makedirs(save_path, exist_ok=True)
-        pdf_filename = f"Skill_{report_data['skill_name']}_Report.pdf"
-        full_path = os.path.join(save_path, pdf_filename)
-
-        c = canvas.Canvas(full_path, pagesize=letter)
-        c.setTitle(f"Skill {report_data['skill_name']} Report")
-
-        # Setup styles
-        styles = getSampleStyleSheet()
-        normal_style = styles['Normal']
-        header_style = styles['h1']
-        level_style = styles['h2']
-        task_style = styles['h3']
-        solution_style = ParagraphStyle(
-            name='SolutionStyle', 
-            parent=normal_style, 
-            fontName='Helvetica-Bold', 
-            fontSize=10, 
-            leading=12
-        )
-        
-        # Improved code style with better formatting
-        code_style = ParagraphStyle(
-            name='CodeStyle',
-            parent=normal_style,
-            fontName='Courier',
-            fontSize=10,
-            leading=12,
-            backColor="#f0f0f0",
-            leftIndent=20,
-            rightIndent=20,
-            spaceBefore=6,
-            spaceAfter=6
-        )
-
-        # Adjust spacing
-        header_style.spaceAfter = 10
-        level_style.spaceAfter = 5
-        task_style.spaceAfter = 3
-        normal_style.spaceAfter = 2
-        solution_style.spaceAfter = 2
-
-        y_position = letter[1] - inch
-        line_height = 12
-
-        def draw_paragraph(text, style=normal_style, leading=None):
-            nonlocal y_position
-            p = Paragraph(text, style)
-            width, height = p.wrapOn(c, letter[0] - 2 * inch, letter[1])
-            if y_position - height < inch:
-                c.showPage()
-                y_position = letter[1] - inch
-            p.drawOn(c, inch, y_position - height)
-            y_position -= height + (leading if leading is not None else style.leading)
-
-        # Draw header with user info
-        if report_data.get('user_name') or report_data.get('user_role'):
-            user_info = []
-            if report_data.get('user_name'):
-                user_info.append(f"<b>Name :</b> {report_data['user_name']}")
-            if report_data.get('user_role'):
-                user_info.append(f"<b>Role:</b> {report_data['user_role']}")
-            
-            user_style = ParagraphStyle(
-                name='UserInfoStyle',
-                parent=normal_style,
-                fontSize=12,
-                leading=14,
-                spaceAfter=12
-            )
-        
-        # Draw main header
-        draw_paragraph(f"Skill {report_data['skill_name']} Report", header_style, leading=14)
-        draw_paragraph("", leading=4)
-
-        for i, level in enumerate(report_data["levels"]):
-            # Process folder path to show only last 3 directories
-            folder_path = level['folder']
-            path_parts = folder_path.replace('\\', '/').split('/')
-            shortened_path = '/'.join(path_parts[-3:]) if len(path_parts) >= 3 else folder_path
-            
-            draw_paragraph(f"Level {i + 1}: {level['level_name']}", level_style)
-            draw_paragraph(f"Folder: {shortened_path}", normal_style, leading=normal_style.fontSize * 1.2)
-            draw_paragraph("", leading=2)
-
-            for j, task in enumerate(level['tasks']):
-                draw_paragraph(f"[{j + 1}] Task: {task['task']}", solution_style)
-                draw_paragraph(f"Solution File: {task['solution_file']}", normal_style)
-
-                if task['code_snippet']:
-                    # Format the code with proper indentation and newlines
-                    formatted_code = task['code_snippet'].replace('\n', '<br/>')
-                    formatted_code = formatted_code.replace(' ', '&nbsp;')
-                    formatted_code = formatted_code.replace('\t', '&nbsp;&nbsp;&nbsp;&nbsp;')
-                    draw_paragraph("Code:", normal_style)
-                    draw_paragraph(formatted_code, code_style)
-
-                # Always include an image - either the selected one or a placeholder
-                try:
-                    if task['image_path']:
-                        img_path = task['image_path']
-                    else:
-                        # Create a placeholder image
-                        img = create_empty_image()
-                        img_path = os.path.join(tempfile.gettempdir(), f"placeholder_{i}_{j}.png")
-                        img.save(img_path)
-                    
-                    reportlab_img = ReportLabImage(img_path)
-                    available_width = letter[0] - 2 * inch
-                    reportlab_img.drawWidth = min(reportlab_img.drawWidth, available_width)
-                    
-                    if y_position - reportlab_img.drawHeight < inch:
-                        c.showPage()
-                        y_position = letter[1] - inch
-
-                    reportlab_img.drawOn(c, inch, y_position - reportlab_img.drawHeight - 0.05 * inch * (72/12))
-                    y_position -= (reportlab_img.drawHeight + 0.5 * inch)  # Increased space after image (0.5 inch)
-                    
-                    # Add extra blank space after image
-                    draw_paragraph("", leading=12)
-
-                    # Add a task separator line (thinner than level separator)
-                    if j < len(level['tasks']) - 1:  # Don't add after last task in level
-                        c.setLineWidth(0.5)  # Thin line
-                        c.setStrokeColorRGB(0.7, 0.7, 0.7)  # Light gray
-                        c.line(inch * 1.5, y_position - 6, letter[0] - inch * 1.5, y_position - 6)
-                        y_position -= 24  # Space after line
-
-                except Exception as e:
-                    draw_paragraph(f"Error embedding image: {e}")
-                
-                # Add significant space between tasks
-                draw_paragraph("", leading=24)  # 24 points space between tasks
-
-            # VERY BIG SPACE BETWEEN LEVELS - 1.5 inches (108 points)
-            if i < len(report_data["levels"]) - 1:  # Don't add after last level
-                y_position -= 1.5 * inch
-                if y_position < inch:  # If we're too close to bottom
-                    c.showPage()
-                    y_position = letter[1] - inch
-                
-                # Visual separator line between levels - more elaborate
-                c.setLineWidth(2.0)  # Thicker line
-                c.setStrokeColorRGB(0.7, 0.7, 0.7)  # Blue color
-                c.line(inch, y_position, letter[0] - inch, y_position)
-
-                # # Add decorative elements to the line
-                # c.setFillColorRGB(0.2, 0.5, 0.8)  # Blue color
-                # c.circle(inch, y_position, 5, fill=1)  # Left circle
-                # c.circle(letter[0] - inch, y_position, 5, fill=1)  # Right circle
-
-                y_position -= 0.25 * inch  # Space after line
-                
-                # Optional: Add "Next Level" text
-                draw_paragraph("→ Next Level →", 
-                    ParagraphStyle(
-                        name='Separator',
-                        parent=normal_style,
-                        fontName='Helvetica-Bold',
-                        fontSize=12,
-                        textColor='#888888',
-                        alignment=1  # Center aligned
-                    ),
-                    leading=12)
-        draw_paragraph("<br/>".join(user_info), user_style)
-
-        c.save()
-        messagebox.showinfo("Success", f"PDF generated successfully at:\n{full_path}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to generate PDF: {str(e)}")
-    finally:
-        progress_bar.set(1.0)
-
 class App(customtkinter.CTk):
     def __init__(self):
         super().__init__()
@@ -541,6 +442,45 @@ class App(customtkinter.CTk):
         self.add_level_button = customtkinter.CTkButton(self, text="Add New Level", command=self.add_level, font=BUTTON_FONT)
         self.add_level_button.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="ew")
 
+        # Re-import automatically when files are added or changed on disk
+        self.course_sync = None
+        self.level_by_folder = {}  # Day folder -> LevelFrame, for imported levels
+        self.syncing = False
+        self.watch_job = None
+        self.watch_var = customtkinter.BooleanVar(value=False)
+        self.watch_checkbox = customtkinter.CTkCheckBox(self, text="Watch course folder for changes", variable=self.watch_var, command=self.toggle_watch, font=LABEL_FONT)
+        self.watch_checkbox.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="w")
+
+        # Save and re-open everything entered here
+        self.project_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.project_frame.grid(row=4, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.project_frame.grid_columnconfigure(0, weight=1)
+        self.project_frame.grid_columnconfigure(1, weight=1)
+
+        self.save_project_button = customtkinter.CTkButton(self.project_frame, text="Save Project", command=self.save_project_file, font=BUTTON_FONT)
+        self.save_project_button.grid(row=0, column=0, padx=(0, 5), pady=0, sticky="ew")
+
+        self.load_project_button = customtkinter.CTkButton(self.project_frame, text="Load Project", command=self.load_project_file, font=BUTTON_FONT)
+        self.load_project_button.grid(row=0, column=1, padx=(5, 0), pady=0, sticky="ew")
+
+        # Search every task's question, file name and code, and jump to a match
+        self.indexer = TaskIndexer()
+        self.search_docs = {}  # Index key -> (LevelFrame, task record)
+        self.level_search_keys = {}  # id(LevelFrame) -> index keys of its tasks
+        self.search_job = None
+        self.search_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.search_frame.grid(row=5, column=0, padx=20, pady=(0, 0), sticky="ew")
+        self.search_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_entry = customtkinter.CTkEntry(self.search_frame, placeholder_text="Search tasks (question, file name or code)", font=ENTRY_FONT)
+        self.search_entry.grid(row=0, column=0, padx=0, pady=0, sticky="ew")
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_entry.bind("<Return>", self.jump_to_first_result)
+
+        self.search_status = customtkinter.CTkLabel(self.search_frame, text="", anchor="w", font=LABEL_FONT)
+        self.search_results = []  # (LevelFrame, record) shown below the box
+        self.search_buttons = []  # One per result row, created on first use and reused
+
         # Frame for level entries with scrollbar
         self.levels_frame = customtkinter.CTkFrame(self)
         self.levels_frame.grid(row=6, column=0, padx=20, pady=(10, 10), sticky="nsew")
@@ -567,18 +507,37 @@ class App(customtkinter.CTk):
         self.levels_inner_frame.bind("<Configure>", lambda e: self.levels_canvas.configure(scrollregion=self.levels_canvas.bbox("all")))
         self.levels_inner_frame.grid_columnconfigure(0, weight=1)
 
+        self.thumbnail_loader = ThumbnailLoader(self)
         self.level_entries = []
-        self.add_level()  # Add default level
-
-        # Progress bar
-        self.progress_bar = customtkinter.CTkProgressBar(self, orientation="horizontal")
-        self.progress_bar.grid(row=7, column=0, padx=20, pady=(10, 20), sticky="ew")
+        self.bulk_depth = 0
+        self.levels_dirty = False
+        # Add the default level once the empty window is on screen, so nothing delays first paint
+        self.default_level_scheduled = False
+        self.bind("<Map>", self.schedule_default_level, add="+")
+
+        # Progress of the running report, and the reports queued behind it
+        self.scheduler = JobScheduler(max_workers=1)
+        self.polling_jobs = False
+        self.progress_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.progress_frame.grid(row=7, column=0, padx=20, pady=(10, 10), sticky="ew")
+        self.progress_frame.grid_columnconfigure(0, weight=1)
+
+        self.progress_bar = customtkinter.CTkProgressBar(self.progress_frame, orientation="horizontal")
+        self.progress_bar.grid(row=0, column=0, padx=0, pady=(5, 0), sticky="ew")
         self.progress_bar.set(0)
 
+        self.status_label = customtkinter.CTkLabel(self.progress_frame, text="", anchor="w", font=LABEL_FONT)
+        self.status_label.grid(row=1, column=0, padx=0, pady=(5, 0), sticky="ew")
+
+        self.cancel_button = customtkinter.CTkButton(self.progress_frame, text="Cancel", width=80, command=self.cancel_reports, font=BUTTON_FONT, state="disabled")
+        self.cancel_button.grid(row=0, column=1, rowspan=2, padx=(10, 0), pady=(5, 0), sticky="e")
+
         # Generate report button
         self.generate_button = customtkinter.CTkButton(self, text="Generate PDF Report", command=self.generate_report, font=BUTTON_FONT)
         self.generate_button.grid(row=8, column=0, padx=20, pady=(10, 20), sticky="ew")
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling"""
         if event.delta:
@@ -588,156 +547,391 @@ class App(customtkinter.CTk):
             self.levels_canvas.yview_scroll(-1 * event.delta, "units")
 
     def import_course_structure(self):
-        """Automatically import course structure from current directory"""
+        """Import the course structure from the current directory; re-imports only apply what changed
+
+        A discovery.json in the current directory can add roots and change what counts as a level or task.
+        """
         base_path = os.getcwd()  # Use current working directory
         print(base_path)
-        
-        try:
-            # Clear existing levels
-            for level in self.level_entries[:]:
-                self.remove_level(level)
-            
-            # Find all Day folders (with or without brackets)
-            day_folders = []
-            for item in os.listdir(base_path):
-                if os.path.isdir(os.path.join(base_path, item)):
-                    # Match both "Day1" and "Day1 [Description]" patterns
-                    day_match = re.match(r'Day(\d+)(?:\s*\[.*\])?', item, re.IGNORECASE)
-                    if day_match:
-                        day_number = int(day_match.group(1))
-                        day_folders.append((day_number, item))
-            
-            # Sort day folders numerically
-            day_folders.sort(key=lambda x: x[0])
-            
-            if not day_folders:
-                messagebox.showwarning("No Day Folders", "No Day folders found in current directory")
+        roots, rules = [base_path], None
+        config_path = os.path.join(base_path, discovery.CONFIG_NAME)
+        if os.path.exists(config_path):
+            try:
+                roots, rules = discovery.load_config(config_path)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Import Error", f"Failed to read {discovery.CONFIG_NAME}:\n{str(e)}")
                 return
-                
-            # Process each day folder
-            for day_number, day_folder in day_folders:
-                full_path = os.path.join(base_path, day_folder)
-                
-                # Extract level name from folder name (e.g., "Day1 [Python Basics]" -> "Python Basics")
-                level_name = day_folder
-                if '[' in day_folder and ']' in day_folder:
-                    level_name = day_folder.split('[')[1].split(']')[0].strip()
-                else:
-                    # If no description in brackets, use default name
-                    level_name = f"Level {day_number}"
-                
-                # Add new level
-                self.add_level()
-                new_level = self.level_entries[-1]
-                new_level.level_name_entry.insert(0, level_name)
-                new_level.folder_entry.insert(0, full_path)
-                
-                # Find all .py files in the day folder
-                py_files = []
-                for f in os.listdir(full_path):
-                    if f.endswith('.py'):
-                        # Try to extract numbers from filename (supports 1.1.py, 1-1.py, etc.)
-                        num_match = re.match(r'(\d+)[\.\-](\d+)', f)
-                        if num_match:
-                            try:
-                                main_num = int(num_match.group(1))
-                                sub_num = int(num_match.group(2))
-                                py_files.append((main_num, sub_num, f))
-                            except:
-                                pass
-                
-                # Sort files by their numbers
-                py_files.sort()
-                py_files = [f[2] for f in py_files]
-                
-                # Add tasks for each .py file
-                for py_file in py_files:
-                    file_path = os.path.join(full_path, py_file)
-                    
-                    # Read first line as task question
-                    task_question = ""
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            first_line = f.readline().strip()
-                            if first_line.startswith('#') or first_line.startswith('"') or first_line.startswith("'"):
-                                task_question = first_line[1:].strip()
-                    except Exception as e:
-                        print(f"Error reading {file_path}: {e}")
-                    
-                    if not task_question:
-                        task_question = f"Complete the exercise in {py_file}"
-                    
-                    # Add task
-                    new_level.add_task()
-                    task = new_level.task_entries[-1]
-                    task.task_entry.insert(0, task_question)
-                    task.solution_entry.insert(0, py_file)
-                    task.set_folder_path(full_path)
-
-                    # Look for matching screenshots
-                    screenshots_dir = os.path.join(full_path, "Screenshots")
-                    if os.path.exists(screenshots_dir):
-                        # Extract task number from filename (e.g., "1.1.py" -> "1.1")
-                        file_prefix = os.path.splitext(py_file)[0]
-                        # Check for image files with matching prefix
-                        for img_ext in ['.png', '.jpg', '.jpeg']:
-                            img_path = os.path.join(screenshots_dir, file_prefix + img_ext)
-                            if os.path.exists(img_path):
-                                task.image_path = img_path
-                                task.display_image_preview(img_path)
-                                break
-
-                    # Look for matching screenshots
-                    screenshots_dir = os.path.join(full_path, "Screenshots")
-                    if os.path.exists(screenshots_dir):
-                        file_prefix = os.path.splitext(py_file)[0]
-
-                        for img_ext in ['.png', '.jpg', '.jpeg']:
-                            img_path = os.path.join(screenshots_dir, file_prefix + img_ext)
-                            if os.path.exists(img_path):
-                                task.image_path = img_path
-                                task.display_image_preview(img_path)
-                                break
-
-
-                    
-
-                if new_level.task_entries:
-                    first_task = new_level.task_entries[0]
-                    new_level.remove_task(first_task)
-                    
-                    # The placeholder image is already set by default in the TaskEntry constructor
-                    
-            messagebox.showinfo("Success", f"Imported {len(self.level_entries)} levels with {sum(len(level.task_entries) for level in self.level_entries)} tasks")
-            
+        if self.course_sync is None or self.course_sync.base_path != roots or self.course_sync.rules != rules:
+            self.course_sync = CourseSync(roots, rules)
+            self.level_by_folder = {}
+        self.start_sync(interactive=True)
+
+    def start_sync(self, interactive):
+        # Snapshot and scan on a worker thread so slow (network) folders don't freeze the window
+        self.automate_button.configure(state="disabled")
+        self.syncing = True
+        sync = self.course_sync
+        result = {}
+
+        def scan():
+            try:
+                result["diff"] = sync.refresh()
+            except Exception as e:
+                result["error"] = e
+                traceback.print_exc()
+
+        thread = threading.Thread(target=scan, daemon=True)
+        thread.start()
+        self.after(50, self.check_import, thread, result, interactive)
+
+    def check_import(self, thread, result, interactive):
+        if thread.is_alive():
+            self.after(50, self.check_import, thread, result, interactive)
+            return
+        self.syncing = False
+        self.automate_button.configure(state="normal")
+        if "error" in result:
+            if interactive:
+                messagebox.showerror("Import Error", f"Failed to import course structure:\n{str(result['error'])}")
+            return
+        with tracing.span("apply_course_diff"):
+            self.apply_course_diff(result["diff"], interactive)
+
+    def apply_course_diff(self, diff, interactive):
+        """Add, remove and update only the levels whose Day folders changed (runs on the Tk thread)"""
+        if diff.initial:
+            self.apply_course_structure(self.course_sync.ordered_levels())
+            return
+        if diff.is_empty():
+            if interactive:
+                messagebox.showinfo("Up to Date", "No changes since the last import")
+            return
+
+        try:
+            with self.bulk_update():
+                for folder in diff.removed:
+                    level_frame = self.level_by_folder.get(folder)
+                    if level_frame is not None:
+                        self.remove_level(level_frame)
+                for folder, level_data in diff.added.items():
+                    self.add_level(default_task=False)
+                    self.level_entries[-1].load_scan(level_data)
+                    self.level_by_folder[folder] = self.level_entries[-1]
+                for folder, (old_level, new_level) in diff.changed.items():
+                    # Levels the user deleted stay deleted
+                    level_frame = self.level_by_folder.get(folder)
+                    if level_frame is not None:
+                        level_frame.merge_scan(old_level, new_level)
+
+                if diff.added:
+                    # Imported levels in day order, manually added ones after them
+                    rank = {id(self.level_by_folder[folder]): k for k, folder in enumerate(diff.order) if folder in self.level_by_folder}
+                    self.level_entries.sort(key=lambda level_frame: rank.get(id(level_frame), len(rank)))
+                    self.update_levels_ui()
+
+            levels = list(diff.added.values()) + [new_level for _, new_level in diff.changed.values()]
+            self.thumbnail_loader.prefetch(
+                task_data["image_path"] for level_data in levels for task_data in level_data["tasks"] if task_data["image_path"]
+            )
+            if interactive:
+                messagebox.showinfo("Success", f"Re-imported course: {diff.summary()}")
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Failed to apply course changes:\n{str(e)}")
+            traceback.print_exc()
+
+    def apply_course_structure(self, levels):
+        """Replace the current levels with scanned course data (runs on the Tk thread)"""
+        if not levels:
+            messagebox.showwarning("No Day Folders", "No Day folders found in current directory")
+            return
+
+        try:
+            # One layout pass for the whole import instead of one per level
+            with self.bulk_update():
+                # Clear existing levels
+                for level in self.level_entries[:]:
+                    self.remove_level(level)
+
+                for level_data in levels:
+                    # Add new level, without the default task load_scan would replace
+                    self.add_level(default_task=False)
+                    self.level_entries[-1].load_scan(level_data)
+                    self.level_by_folder[level_data["folder"]] = self.level_entries[-1]
+
+            # Warm the thumbnail cache for tasks that aren't visible yet
+            self.thumbnail_loader.prefetch(
+                task_data["image_path"] for level_data in levels for task_data in level_data["tasks"] if task_data["image_path"]
+            )
+
+            messagebox.showinfo("Success", f"Imported {len(self.level_entries)} levels with {sum(len(level.tasks) for level in self.level_entries)} tasks")
+
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import course structure:\n{str(e)}")
-            import traceback
             traceback.print_exc()
 
+    def toggle_watch(self):
+        if self.watch_job is not None:
+            self.after_cancel(self.watch_job)
+            self.watch_job = None
+        if self.watch_var.get():
+            self.watch_job = self.after(WATCH_MS, self.poll_course)
+
+    def poll_course(self):
+        """Quietly re-import in the background while "Watch" is ticked"""
+        self.watch_job = self.after(WATCH_MS, self.poll_course)
+        if self.course_sync is not None and self.course_sync.refreshed and not self.syncing:
+            self.start_sync(interactive=False)
+
     def browse_save_location(self):
         folder_selected = filedialog.askdirectory()
         if folder_selected:
-            self.save_location_path = folder_selected
-            self.save_location_entry.configure(state="normal")
-            self.save_location_entry.delete(0, customtkinter.END)
-            self.save_location_entry.insert(0, self.save_location_path)
-            self.save_location_entry.configure(state="readonly")
+            self.set_save_location(folder_selected)
+
+    def set_save_location(self, path):
+        self.save_location_path = path
+        self.save_location_entry.configure(state="normal")
+        self.save_location_entry.delete(0, customtkinter.END)
+        self.save_location_entry.insert(0, self.save_location_path)
+        self.save_location_entry.configure(state="readonly")
+
+    def collect_report_data(self):
+        """Everything entered in the form, as report_data (without code)"""
+        return {
+            "skill_name": self.skill_entry.get(),
+            "user_name": self.user_name_entry.get(),
+            "user_role": self.user_role_entry.get(),
+            "levels": [level_frame.get_level_data() for level_frame in self.level_entries],
+        }
+
+    def save_project_file(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=project.EXTENSION, filetypes=[("Skill Report project", f"*{project.EXTENSION}")]
+        )
+        if not path:
+            return
 
-    def add_level(self):
+        # Hashing the referenced files can take a while the first time; do it off the Tk thread
+        report_data = self.collect_report_data()
+        save_location = self.save_location_path
+        self.save_project_button.configure(state="disabled")
+        result = {}
+
+        def save():
+            try:
+                project.save_project(path, project.build_project(report_data, save_location))
+            except Exception as e:
+                result["error"] = e
+                traceback.print_exc()
+
+        thread = threading.Thread(target=save, daemon=True)
+        thread.start()
+        self.after(50, self.check_project_save, thread, result, path)
+
+    def check_project_save(self, thread, result, path):
+        if thread.is_alive():
+            self.after(50, self.check_project_save, thread, result, path)
+            return
+        self.save_project_button.configure(state="normal")
+        if "error" in result:
+            messagebox.showerror("Save Error", f"Failed to save project:\n{str(result['error'])}")
+        else:
+            messagebox.showinfo("Success", f"Project saved to:\n{path}")
+
+    def load_project_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Skill Report project", f"*{project.EXTENSION}"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with tracing.span("load_project"):
+                data = project.load_project(path)
+                self.apply_project(data)
+        except Exception as e:
+            messagebox.showerror("Load Error", f"Failed to load project:\n{str(e)}")
+            traceback.print_exc()
+            return
+        self.check_project_references(data)
+
+    def check_project_references(self, data):
+        """Hash the project's files off the Tk thread and warn if any changed since it was saved"""
+        result = {}
+
+        def check():
+            try:
+                result["stale"] = project.stale_references(data)
+            except Exception:
+                traceback.print_exc()
+
+        thread = threading.Thread(target=check, daemon=True)
+        thread.start()
+        self.after(100, self.report_stale_references, thread, result)
+
+    def report_stale_references(self, thread, result):
+        if thread.is_alive():
+            self.after(100, self.report_stale_references, thread, result)
+            return
+        if result.get("stale"):
+            messagebox.showwarning("Project Out of Date", project.describe_stale(result["stale"]))
+
+    def apply_project(self, data):
+        """Replace the form with a loaded project; code and thumbnails load as tasks are shown"""
+        set_entry_text(self.user_name_entry, data.get("user_name", ""))
+        set_entry_text(self.user_role_entry, data.get("user_role", ""))
+        set_entry_text(self.skill_entry, data.get("skill_name", ""))
+        if data.get("save_location"):
+            self.set_save_location(data["save_location"])
+
+        # Project levels are not tied to an Auto-Import any more
+        self.course_sync = None
+        self.level_by_folder = {}
+        with self.bulk_update():
+            for level in self.level_entries[:]:
+                self.remove_level(level)
+            for level_data in data["levels"]:
+                self.add_level(default_task=False)
+                self.level_entries[-1].load_scan(level_data)
+
+    def schedule_default_level(self, event):
+        """On the window's first <Map>: add the default level after the redraws it queues have run"""
+        if event.widget is not self or self.default_level_scheduled:
+            return
+        self.default_level_scheduled = True
+        # An idle callback still shares the idle pass that draws the window; a timer set from it fires after
+        self.after_idle(self.after, 0, self.add_default_level)
+
+    def add_default_level(self):
+        if not self.level_entries:  # A project may have been loaded already
+            self.add_level()
+
+    @contextmanager
+    def bulk_update(self):
+        """Batch level changes: the level list is laid out once, on exit"""
+        self.bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self.bulk_depth -= 1
+            if not self.bulk_depth and self.levels_dirty:
+                self.update_levels_ui()
+
+    def add_level(self, default_task=True):
         level_number = len(self.level_entries) + 1
-        level_frame = LevelFrame(self.levels_inner_frame, level_number, self.remove_level)
+        level_frame = LevelFrame(self.levels_inner_frame, level_number, self.remove_level, self.thumbnail_loader,
+                                 default_task, self.index_level)
         level_frame.grid(row=level_number - 1, column=0, padx=15, pady=(10, 10), sticky="nsew")
         self.level_entries.append(level_frame)
         self.update_levels_ui()
 
     def remove_level(self, level_to_remove):
         if level_to_remove in self.level_entries:
+            for folder, level_frame in list(self.level_by_folder.items()):
+                if level_frame is level_to_remove:
+                    del self.level_by_folder[folder]
+            self.forget_level(level_to_remove)
             level_to_remove.destroy()
             self.level_entries.remove(level_to_remove)
             self.update_levels_ui()
 
+    def index_level(self, level_frame, records=None):
+        """Queue a level's changed records (or all of them, dropping deleted ones) for the search index"""
+        folder = level_frame.folder_entry.get()
+        if records is None:
+            records = level_frame.tasks
+            keys = {id(record) for record in records}
+            for key in self.level_search_keys.get(id(level_frame), set()) - keys:
+                self.indexer.remove(key)
+                self.search_docs.pop(key, None)
+            self.level_search_keys[id(level_frame)] = keys
+        else:
+            self.level_search_keys.setdefault(id(level_frame), set()).update(id(record) for record in records)
+        for record in records:
+            self.search_docs[id(record)] = (level_frame, record)
+            solution_file = record["solution_file"]
+            code_path = os.path.join(folder, solution_file) if folder and solution_file else None
+            self.indexer.submit(id(record), record["task"], solution_file, code_path)
+
+    def forget_level(self, level_frame):
+        for key in self.level_search_keys.pop(id(level_frame), ()):
+            self.indexer.remove(key)
+            self.search_docs.pop(key, None)
+
+    def schedule_search(self, event=None):
+        # Wait for a pause in typing instead of searching on every key
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        for level_frame in self.level_entries:
+            level_frame.task_view.commit()  # Edits in the visible tasks count too
+        query = self.search_entry.get().strip()
+        if not query:
+            self.show_search_results([], "")
+            return
+        with tracing.span("search"):
+            hits = self.indexer.index.search(query, MAX_SEARCH_RESULTS)
+        results = [self.search_docs[key] for _, key in hits if key in self.search_docs]
+        indexing = self.indexer.busy()
+        if results:
+            message = "Still indexing, more matches may appear..." if indexing else ""
+        else:
+            message = "Indexing tasks..." if indexing else "No matching tasks"
+        self.show_search_results(results, message)
+        if indexing:
+            self.search_job = self.after(SEARCH_RETRY_MS, self.run_search)
+
+    def show_search_results(self, results, message):
+        self.search_results = results
+        while len(self.search_buttons) < len(results):
+            self.search_buttons.append(customtkinter.CTkButton(
+                self.search_frame, text="", anchor="w", font=LABEL_FONT, fg_color="transparent", border_width=1
+            ))
+        for k, button in enumerate(self.search_buttons):
+            if k < len(results):
+                level_frame, record = results[k]
+                button.configure(text=self.describe_search_result(level_frame, record),
+                                 command=lambda level_frame=level_frame, record=record: self.jump_to_task(level_frame, record))
+                button.grid(row=k + 2, column=0, padx=0, pady=(4, 0), sticky="ew")
+            else:
+                button.grid_remove()
+        self.search_status.configure(text=message)
+        if message:
+            self.search_status.grid(row=1, column=0, padx=0, pady=(4, 0), sticky="ew")
+        else:
+            self.search_status.grid_remove()
+
+    def describe_search_result(self, level_frame, record):
+        level_number = self.level_entries.index(level_frame) + 1 if level_frame in self.level_entries else "?"
+        task_number = next((k + 1 for k, task in enumerate(level_frame.tasks) if task is record), "?")
+        level_name = level_frame.level_name_entry.get() or "Untitled level"
+        text = f"Level {level_number} ({level_name}), Task {task_number}: {record['task'] or record['solution_file']}"
+        return text if len(text) <= 100 else text[:97] + "..."
+
+    def jump_to_task(self, level_frame, record):
+        """Show record in its level and scroll the level into view"""
+        if level_frame not in self.level_entries:
+            return
+        index = next((k for k, task in enumerate(level_frame.tasks) if task is record), None)
+        if index is None:
+            return  # Deleted since the search ran
+        level_frame.show_task(index)
+        self.levels_inner_frame.update_idletasks()
+        height = self.levels_inner_frame.winfo_height()
+        if height:
+            self.levels_canvas.yview_moveto(level_frame.winfo_y() / height)
+
+    def jump_to_first_result(self, event=None):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.run_search()
+        if self.search_results:
+            self.jump_to_task(*self.search_results[0])
+
     def update_levels_ui(self):
+        if self.bulk_depth:
+            self.levels_dirty = True
+            return
+        self.levels_dirty = False
         for i, level_frame in enumerate(self.level_entries):
             level_frame.level_label.configure(text=f"Level {i + 1}:")
             level_frame.grid(row=i, column=0, padx=15, pady=(10, 10), sticky="ewn")
@@ -785,22 +979,54 @@ class App(customtkinter.CTk):
             report_data["levels"].append(level_data)
 
         try:
-            self.generate_button.configure(state="disabled")
-            threading.Thread(
-                target=generate_pdf_report,
-                args=(report_data, self.progress_bar, self, self.save_location_path),
-                daemon=True
-            ).start()
-            self.after(100, self.check_thread)
+            # Queued behind any report already rendering; the form stays editable meanwhile
+            self.scheduler.submit(report_data, self.save_location_path)
         except Exception as e:
             messagebox.showerror("Generation Error", f"Failed to start PDF generation: {str(e)}")
-            self.generate_button.configure(state="normal")
-
-    def check_thread(self):
-        if threading.active_count() > 1:
-            self.after(100, self.check_thread)
+            return
+        self.cancel_button.configure(state="normal")
+        if not self.polling_jobs:
+            self.polling_jobs = True
+            self.after(JOB_POLL_MS, self.check_jobs)
+
+    def check_jobs(self):
+        """Apply job events on the Tk thread; polls until no report is queued or running"""
+        active = self.scheduler.active_count()  # Read first, so no final event can be missed
+        for event in self.scheduler.poll():
+            self.handle_job_event(event, active)
+        if active:
+            self.after(JOB_POLL_MS, self.check_jobs)
         else:
-            self.generate_button.configure(state="normal")
+            self.polling_jobs = False
+            self.cancel_button.configure(state="disabled")
+
+    def handle_job_event(self, event, active):
+        waiting = f" ({active - 1} more queued)" if active > 1 else ""
+        if event.kind == "queued":
+            self.status_label.configure(text=f"{event.name}: queued{waiting}")
+        elif event.kind in ("started", "progress"):
+            self.progress_bar.set(event.fraction)
+            self.status_label.configure(text=f"{event.name}: {event.message}{waiting}")
+        elif event.kind == "done":
+            self.progress_bar.set(1.0)
+            self.status_label.configure(text=f"{event.name}: saved to {event.result}")
+            messagebox.showinfo("Success", f"PDF generated successfully at:\n{event.result}")
+        elif event.kind == "failed":
+            self.progress_bar.set(0)
+            self.status_label.configure(text=f"{event.name}: failed")
+            messagebox.showerror("Error", f"Failed to generate PDF: {event.message}")
+        elif event.kind == "cancelled":
+            self.progress_bar.set(0)
+            self.status_label.configure(text=f"{event.name}: cancelled")
+
+    def cancel_reports(self):
+        """Stop the running report and drop the queued ones"""
+        self.scheduler.cancel_all()
+
+    def on_close(self):
+        self.scheduler.shutdown()
+        self.thumbnail_loader.shutdown()
+        self.destroy()
 
 if __name__ == "__main__":
     app = App()
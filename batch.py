@@ -0,0 +1,181 @@
+"""Cohort batch mode: render one Skill Report per manifest row across a process pool.
+
+The manifest is a CSV (with a header row) or a JSON list of objects with the
+columns user_name, user_role, skill_name and course_root. An optional output
+column overrides the folder a report is written to; by default each report goes
+to <output>/<user_name>/.
+
+Finished jobs are appended to a checkpoint file as they complete, so re-running
+the same command after a crash only renders what is missing:
+
+    python -m batch cohort.csv --output reports/ --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import report_engine
+
+MANIFEST_FIELDS = ("user_name", "user_role", "skill_name", "course_root")
+CHECKPOINT_NAME = ".batch_checkpoint.jsonl"
+
+
+def read_manifest(manifest_path):
+    """Load manifest rows from a .csv or .json file"""
+    if manifest_path.lower().endswith('.json'):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    jobs = []
+    for line_number, row in enumerate(rows, start=1):
+        row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        missing = [field for field in ("skill_name", "course_root") if not row.get(field)]
+        if missing:
+            raise ValueError(f"Manifest row {line_number}: missing {', '.join(missing)}")
+        job = {field: row.get(field, "") for field in MANIFEST_FIELDS}
+        job["output"] = row.get("output", "")
+        jobs.append(job)
+    return jobs
+
+
+def job_id(job):
+    """Stable identifier used to match jobs against the checkpoint"""
+    return "|".join(job[field] for field in MANIFEST_FIELDS)
+
+
+def safe_folder_name(name):
+    return re.sub(r'[^\w\-. ]+', '_', name).strip() or "unnamed"
+
+
+def job_output_folder(job, output_root):
+    if job["output"]:
+        return job["output"]
+    return os.path.join(output_root, safe_folder_name(job["user_name"] or job["skill_name"]))
+
+
+def load_checkpoint(checkpoint_path):
+    """Return {job_id: record} for every job the checkpoint marks as done"""
+    done = {}
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn last line from a crash
+            if record.get("status") == "ok":
+                done[record["id"]] = record
+    return done
+
+
+def append_checkpoint(checkpoint_file, record):
+    checkpoint_file.write(json.dumps(record) + "\n")
+    checkpoint_file.flush()
+    os.fsync(checkpoint_file.fileno())
+
+
+def render_job(job, output_folder, options=None):
+    """Worker entry point: build and render one report, never raising"""
+    start = time.perf_counter()
+    record = {"id": job_id(job), "user_name": job["user_name"], "skill_name": job["skill_name"]}
+    try:
+        report_data = report_engine.build_report_data(
+            job["course_root"], job["skill_name"], job["user_name"], job["user_role"]
+        )
+        if not report_data["levels"]:
+            raise ValueError(f"No Day folders found in {job['course_root']}")
+        full_path = report_engine.generate_pdf_report(report_data, output_folder, options=options)
+        record.update(status="ok", path=full_path, bytes=os.path.getsize(full_path))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(jobs, output_root, workers=None, checkpoint_path=None, restart=False, options=None, log=print):
+    """Render every job not already in the checkpoint and return a summary dict"""
+    os.makedirs(output_root, exist_ok=True)
+    checkpoint_path = checkpoint_path or os.path.join(output_root, CHECKPOINT_NAME)
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    done = load_checkpoint(checkpoint_path)
+
+    pending = [job for job in jobs if job_id(job) not in done]
+    summary = {
+        "total": len(jobs),
+        "skipped": len(jobs) - len(pending),
+        "succeeded": 0,
+        "failed": 0,
+        "bytes": 0,
+        "render_seconds": 0.0,
+        "errors": [],
+    }
+    if pending:
+        log(f"Rendering {len(pending)} report(s), {summary['skipped']} already done")
+
+    start = time.perf_counter()
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint_file:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_job, job, job_output_folder(job, output_root), options) for job in pending]
+            for completed, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                append_checkpoint(checkpoint_file, record)
+                summary["render_seconds"] += record["seconds"]
+                if record["status"] == "ok":
+                    summary["succeeded"] += 1
+                    summary["bytes"] += record["bytes"]
+                    log(f"[{completed}/{len(pending)}] {record['path']} ({record['seconds']:.2f}s)")
+                else:
+                    summary["failed"] += 1
+                    summary["errors"].append(record)
+                    log(f"[{completed}/{len(pending)}] FAILED {record['id']}: {record['error']}")
+    summary["wall_seconds"] = time.perf_counter() - start
+    return summary
+
+
+def format_summary(summary):
+    wall = summary["wall_seconds"]
+    rendered = summary["succeeded"] + summary["failed"]
+    lines = [
+        f"Reports: {summary['succeeded']} ok, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped (of {summary['total']})",
+        f"Wall time: {wall:.2f}s, render time: {summary['render_seconds']:.2f}s",
+    ]
+    if rendered and wall > 0:
+        lines.append(
+            f"Throughput: {rendered / wall:.2f} reports/s, "
+            f"{summary['bytes'] / wall / (1024 * 1024):.2f} MB/s, "
+            f"speedup over serial: {summary['render_seconds'] / wall:.1f}x"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch", description="Generate one Skill Report per manifest row.")
+    parser.add_argument("manifest", help="CSV or JSON manifest of user_name, user_role, skill_name, course_root")
+    parser.add_argument("--output", default=os.getcwd(), help="Root folder for the generated reports")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint", default=None, help=f"Checkpoint file (default: <output>/{CHECKPOINT_NAME})")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and render everything again")
+    report_engine.add_option_arguments(parser)
+    args = parser.parse_args(argv)
+
+    summary = run_batch(
+        read_manifest(args.manifest), args.output, args.workers, args.checkpoint, args.restart,
+        report_engine.options_from_args(args)
+    )
+    print(format_summary(summary))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Performance benchmark for course import and PDF generation.
+
+Builds a synthetic course in the layout Auto-Import expects (DayN [Name]
+folders of N.M.py files whose first line is the question, plus
+Screenshots/N.M.png), then times scanning, report_data assembly and
+generate_pdf_report headlessly, once per render mode. Each mode runs in its own
+spawned process so peak memory is measured in isolation.
+
+    python -m benchmark --days 20 --tasks 15 --save results.json
+    python -m benchmark --days 20 --tasks 15 --baseline results.json
+
+With --baseline, any metric more than --threshold percent worse than the stored
+run is flagged and the exit status is 1.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw
+
+import course_scanner
+import report_engine
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TOPICS = ["Variables", "Loops", "Functions", "Lists", "Dictionaries", "Classes", "Files", "Errors", "Modules", "Testing"]
+
+# ReportOptions overrides per mode; every mode renders the same course
+MODES = {
+    "serial": {},
+    "stream": {"stream": True, "memory_limit_mb": 16},
+    "parallel": {"parallel_workers": os.cpu_count() or 1},
+    "incremental": {"incremental": True},
+}
+
+# Metric -> True when bigger is better
+METRICS = {
+    "scan_s": False,
+    "assemble_s": False,
+    "render_s": False,
+    "rerender_s": False,
+    "peak_rss_mb": False,
+    "output_kb": False,
+    "pages_per_s": True,
+}
+
+
+def make_screenshot(path, size, rng):
+    """A busy, screenshot-like PNG: coloured bands with blocks of 'text'"""
+    width, height = size
+    img = Image.new("RGB", size, (30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    for top in range(0, height, max(1, height // 12)):
+        shade = rng.randrange(20, 70)
+        draw.rectangle([0, top, width, top + height // 24], fill=(shade, shade, shade + 20))
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        draw.rectangle([x, y, x + rng.randrange(20, max(21, width // 4)), y + 8], fill=color)
+    img.save(path, "PNG")
+
+
+def make_course(root, days=10, tasks=10, image_size=(1280, 800), code_lines=40, image_ratio=1.0, seed=1):
+    """Write a synthetic course under root and return the number of tasks"""
+    rng = random.Random(seed)
+    count = 0
+    for day in range(1, days + 1):
+        folder = os.path.join(root, f"Day{day} [{TOPICS[(day - 1) % len(TOPICS)]} {day}]")
+        screenshots = os.path.join(folder, "Screenshots")
+        os.makedirs(screenshots, exist_ok=True)
+        for task in range(1, tasks + 1):
+            lines = [f"# Write a program that solves exercise {day}.{task}"]
+            for k in range(code_lines - 1):
+                lines.append(f"value_{k} = sum(range({rng.randrange(1000)})) * {k}  # step {k}")
+            with open(os.path.join(folder, f"{day}.{task}.py"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            if rng.random() < image_ratio:
+                make_screenshot(os.path.join(screenshots, f"{day}.{task}.png"), image_size, rng)
+            count += 1
+    return count
+
+
+def own_peak_rss_mb():
+    """Peak RSS of this process's own memory (VmHWM), or None where there is no /proc
+
+    ru_maxrss can't tell: a child starts from its parent's high-water mark, even across exec.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb():
+    """Peak RSS of this process and the ones it started (parallel mode's workers)"""
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    own = own_peak_rss_mb()
+    if own is None:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return round(max(own, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale), 1)
+
+
+def count_pages(path):
+    with open(path, "rb") as f:
+        return len(re.findall(rb"/Type\s*/Page(?![s\w])", f.read()))
+
+
+def run_mode(course_root, mode, work_dir):
+    """Time one mode end to end (runs in a fresh process) and return its metrics"""
+    options = report_engine.ReportOptions(image_cache_dir=os.path.join(work_dir, "image_cache"), **MODES[mode])
+    output = os.path.join(work_dir, "reports")
+
+    start = time.perf_counter()
+    course_scanner.scan_course(course_root)
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if options.stream:
+        report_data = report_engine.stream_report_data(course_root, "Benchmark", "Bench User", "Trainee")
+    else:
+        report_data = report_engine.build_report_data(course_root, "Benchmark", "Bench User", "Trainee")
+    assemble_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full_path = report_engine.generate_pdf_report(report_data, output, options=options)
+    render_s = time.perf_counter() - start
+
+    # Same report again: warm image cache, and for incremental mode, warm fragments
+    if options.stream:
+        report_data = report_engine.stream_report_data(course_root, "Benchmark", "Bench User", "Trainee")
+    start = time.perf_counter()
+    report_engine.generate_pdf_report(report_data, output, options=options)
+    rerender_s = time.perf_counter() - start
+
+    pages = count_pages(full_path)
+    return {
+        "scan_s": round(scan_s, 4),
+        "assemble_s": round(assemble_s, 4),
+        "render_s": round(render_s, 4),
+        "rerender_s": round(rerender_s, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "output_kb": round(os.path.getsize(full_path) / 1024, 1),
+        "pages": pages,
+        "pages_per_s": round(pages / render_s, 2) if render_s else None,
+    }
+
+
+def run_benchmark(config, modes, log=print):
+    """Build the course described by config and return the results document"""
+    work_root = tempfile.mkdtemp(prefix="report_maker_bench_")
+    try:
+        course_root = os.path.join(work_root, "course")
+        start = time.perf_counter()
+        task_count = make_course(course_root, config["days"], config["tasks"], tuple(config["image_size"]),
+                                 config["code_lines"], config["image_ratio"], config["seed"])
+        log(f"Built {task_count} tasks in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+        for mode in modes:
+            work_dir = os.path.join(work_root, mode)
+            # Spawned, not forked: a forked worker's RSS would start with everything this process holds
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results[mode] = pool.submit(run_mode, course_root, mode, work_dir).result()
+            log(f"{mode}: " + ", ".join(f"{key}={value}" for key, value in results[mode].items()))
+        return {
+            "config": config,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+
+def compare(current, baseline, threshold=10.0):
+    """Lines describing each metric's change against baseline, and whether any regressed"""
+    lines = []
+    regressed = False
+    for mode, metrics in current["results"].items():
+        old = baseline.get("results", {}).get(mode)
+        if old is None:
+            lines.append(f"{mode}: not in baseline")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            new_value, old_value = metrics.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value * 100
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = "  <-- REGRESSION"
+                regressed = True
+            lines.append(f"{mode}.{metric}: {old_value} -> {new_value} ({change:+.1f}%){flag}")
+    if current.get("config") != baseline.get("config"):
+        lines.append("warning: baseline was recorded with a different course configuration")
+    return lines, regressed
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return [int(width), int(height)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Benchmark course import and PDF generation.")
+    parser.add_argument("--days", type=int, default=10, help="Day folders in the synthetic course")
+    parser.add_argument("--tasks", type=int, default=10, help="Tasks per Day folder")
+    parser.add_argument("--image-size", type=parse_size, default=[1280, 800], metavar="WxH", help="Screenshot resolution")
+    parser.add_argument("--image-ratio", type=float, default=1.0, help="Share of tasks that have a screenshot")
+    parser.add_argument("--code-lines", type=int, default=40, help="Lines per solution file")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--modes", default="serial", help=f"Comma-separated render modes: {', '.join(MODES)}")
+    parser.add_argument("--save", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --save")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change counted as a regression")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    config = {
+        "days": args.days, "tasks": args.tasks, "image_size": args.image_size, "image_ratio": args.image_ratio,
+        "code_lines": args.code_lines, "seed": args.seed,
+    }
+    current = run_benchmark(config, modes)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare(current, baseline, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Monospace code block renderer for solution files.
+
+Code is drawn line by line with canvas text objects instead of a Paragraph, so
+there is no markup to escape, no reflow, and the block can continue across as
+many pages as it needs. Layout is a single linear pass over the lines.
+"""
+from reportlab.lib.colors import toColor
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+TAB_SIZE = 4
+PADDING = 4  # Space between the background edge and the text
+LINE_NUMBER_COLOR = "#888888"
+
+
+def code_lines(code, max_chars, wrap=True):
+    """Split code into (line_number, text) rows no wider than max_chars
+
+    Continuation rows of a hard-wrapped line have line_number None. With wrap=False
+    long lines are cut at the box edge instead.
+    """
+    rows = []
+    max_chars = max(1, max_chars)
+    for number, line in enumerate(code.expandtabs(TAB_SIZE).splitlines(), start=1):
+        if len(line) <= max_chars:
+            rows.append((number, line))
+        elif wrap:
+            rows.append((number, line[:max_chars]))
+            for start in range(max_chars, len(line), max_chars):
+                rows.append((None, line[start:start + max_chars]))
+        else:
+            rows.append((number, line[:max_chars - 1] + "…"))
+    return rows
+
+
+def draw_code_block(renderer, code, style, line_numbers=False, wrap=True):
+    """Draw code at renderer.y_position using style's font, indents and background
+
+    Starts a new page whenever the current one is full and leaves renderer.y_position
+    below the block.
+    """
+    c = renderer.c
+    font_name, font_size, leading = style.fontName, style.fontSize, style.leading
+    x = renderer.left_margin + style.leftIndent
+    width = renderer.page_width - 2 * renderer.left_margin - style.leftIndent - style.rightIndent
+    char_width = stringWidth("M", font_name, font_size)
+
+    line_count = code.count("\n") + 1
+    gutter = (len(str(line_count)) + 1) * char_width if line_numbers else 0
+    rows = code_lines(code, int((width - 2 * PADDING - gutter) // char_width), wrap)
+    background = toColor(style.backColor) if style.backColor else None
+
+    renderer.y_position -= style.spaceBefore
+    index = 0
+    while index < len(rows):
+        fit = int((renderer.y_position - renderer.bottom_margin - 2 * PADDING) // leading)
+        if fit < 1:
+            renderer.new_page()
+            continue
+        chunk = rows[index:index + fit]
+        height = len(chunk) * leading + 2 * PADDING
+        top = renderer.y_position
+
+        c.saveState()
+        if background is not None:
+            c.setFillColor(background)
+            c.rect(x, top - height, width, height, stroke=0, fill=1)
+
+        baseline = top - PADDING - font_size
+        if line_numbers:
+            numbers = c.beginText(x + PADDING, baseline)
+            numbers.setFont(font_name, font_size, leading)
+            numbers.setFillColor(LINE_NUMBER_COLOR)
+            for number, _ in chunk:
+                numbers.textLine(str(number) if number else "")
+            c.drawText(numbers)
+
+        text = c.beginText(x + PADDING + gutter, baseline)
+        text.setFont(font_name, font_size, leading)
+        text.setFillColor(style.textColor)
+        for _, line in chunk:
+            text.textLine(line)
+        c.drawText(text)
+        c.restoreState()
+
+        renderer.y_position = top - height
+        index += len(chunk)
+        if index < len(rows):
+            renderer.new_page()
+
+    renderer.y_position -= style.spaceAfter
@@ -0,0 +1,148 @@
+"""Course structure discovery shared by the GUI Auto-Import and the headless engine.
+
+Returns plain data (lists and dicts) so callers can apply it however they like:
+the GUI turns it into LevelFrame/TaskEntry widgets, the engine into report_data.
+The course can be a folder or a .zip/.tar.gz archive (see course_source), or
+several of them, and what counts as a level, task or screenshot is set by
+discovery.DiscoveryRules (rules=None: the DayN / N.M.py / Screenshots layout).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import course_source
+import discovery
+import tracing
+
+SCAN_WORKERS = 8  # Threads listing folders and reading questions; network shares need several in flight
+
+
+def level_name_from_folder(day_folder, day_number):
+    """Extract level name from folder name (e.g., "Day1 [Python Basics]" -> "Python Basics")"""
+    if '[' in day_folder and ']' in day_folder:
+        return day_folder.split('[')[1].split(']')[0].strip()
+    # If no description in brackets, use default name
+    return f"Level {day_number}"
+
+
+def read_task_question(file_path, py_file):
+    """Read first line of a solution file as the task question"""
+    task_question = ""
+    try:
+        with tracing.span("read_question"), course_source.open_text(file_path) as f:
+            first_line = f.readline().strip()
+            if first_line.startswith('#') or first_line.startswith('"') or first_line.startswith("'"):
+                task_question = first_line[1:].strip()
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+
+    if not task_question:
+        task_question = f"Complete the exercise in {py_file}"
+    return task_question
+
+
+def screenshot_for(py_file, screenshots):
+    """The screenshot named like a task file (in any subfolder), or None"""
+    return screenshots.get(os.path.splitext(os.path.basename(py_file))[0])
+
+
+def scan_day_folder(full_path, rules=None):
+    """List one level folder: its task files (relative paths) in natural order and its screenshot index"""
+    with tracing.span("scan_day_folder"):
+        return list_day_folder(full_path, rules)
+
+
+def list_day_folder(full_path, rules=None):
+    return listing_from_walk(discovery.walk_level(full_path, rules), rules)
+
+
+def listing_from_walk(walked, rules=None):
+    """(task files, screenshot index) of a level from its discovery.walk_level entries"""
+    matcher = (rules or discovery.DEFAULT_RULES).matcher()
+    py_files = []
+    screenshots = {}
+    best = {}  # stem -> rank of the screenshot kept
+    for kind, relative_path, entry in walked:
+        if kind == "task":
+            py_files.append((discovery.natural_key(entry.name), relative_path))
+        else:
+            # One index for every screenshot folder; .png wins over .jpg over .jpeg
+            stem = os.path.splitext(entry.name)[0]
+            rank = matcher.screenshot_rank(entry.name)
+            if stem not in best or rank < best[stem]:
+                best[stem] = rank
+                screenshots[stem] = entry.path
+    py_files.sort()
+    return [f[1] for f in py_files], screenshots
+
+
+def find_day_folders(base_path, rules=None):
+    """Level folders under base_path (one root or a list) as (day_number, folder_name, full_path), in order"""
+    return discovery.find_level_folders(base_path, rules)
+
+
+def scan_course(base_path, max_workers=SCAN_WORKERS, rules=None):
+    """Find all level folders under base_path (one root or a list) and describe their levels and tasks
+
+    Each folder is listed once with os.scandir and first lines are read on a thread
+    pool, which keeps network shares from serialising on per-file latency. Returns a
+    list of level dicts ({"level_name", "folder", "tasks"}) where each task is
+    {"task", "solution_file", "image_path"}. Code is not read here.
+    """
+    with tracing.span("scan_course"):
+        return scan_folders(find_day_folders(base_path, rules), max_workers, rules)
+
+
+def scan_folders(day_folders, max_workers, rules=None, listings=None):
+    """scan_course for the given (day_number, folder_name, full_path) folders
+
+    listings, if given, holds each folder's list_day_folder result, from a walk the caller already made.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        if listings is None:
+            listings = list(pool.map(lambda folder: scan_day_folder(folder[2], rules), day_folders))
+
+        levels = []
+        question_futures = []
+        for (day_number, day_folder, full_path), (py_files, screenshots) in zip(day_folders, listings):
+            tasks = []
+            for py_file in py_files:
+                tasks.append({
+                    "task": "",
+                    "solution_file": py_file,
+                    "image_path": screenshot_for(py_file, screenshots),
+                })
+                question_futures.append(
+                    (tasks[-1], pool.submit(read_task_question, os.path.join(full_path, py_file), py_file))
+                )
+            levels.append({
+                "level_name": level_name_from_folder(day_folder, day_number),
+                "folder": full_path,
+                "tasks": tasks,
+            })
+
+        for task, future in question_futures:
+            task["task"] = future.result()
+    return levels
+
+
+def iter_levels(day_folders, rules=None):
+    """Lazy scan_course for streaming: each level is listed, and its tasks are read, only when reached
+
+    day_folders comes from find_day_folders. Every level's "tasks" is a generator.
+    """
+    for day_number, day_folder, full_path in day_folders:
+        py_files, screenshots = scan_day_folder(full_path, rules)
+        yield {
+            "level_name": level_name_from_folder(day_folder, day_number),
+            "folder": full_path,
+            "tasks": iter_tasks(full_path, py_files, screenshots),
+        }
+
+
+def iter_tasks(full_path, py_files, screenshots):
+    for py_file in py_files:
+        yield {
+            "task": read_task_question(os.path.join(full_path, py_file), py_file),
+            "solution_file": py_file,
+            "image_path": screenshot_for(py_file, screenshots),
+        }
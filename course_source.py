@@ -0,0 +1,244 @@
+"""Course sources: read a course from a folder, a .zip or a .tar(.gz) without extracting it.
+
+A path inside an archive is written as if the archive were a folder
+("cohort/alice.zip/Day1 [Basics]/1.1.py"), so levels, tasks and project files
+keep holding plain path strings and every module reads them through this one
+place. An archive's member list is indexed once and its handle is kept open for
+the life of the process; open_source() re-indexes it only if the archive file
+itself changed. Paths outside archives go straight to the filesystem.
+
+Zip members are read independently of each other. A compressed tar can only be
+read front to back, and every seek back restarts decompression from the start,
+so the indexing pass, which has to decompress everything anyway, keeps what it
+passes: small members (the solution files) in memory and larger ones (the
+screenshots) copied to a temporary spool file, read back in any order.
+"""
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+SMALL_MEMBER_BYTES = 64 * 1024  # Compressed tar members up to this size are kept in memory, larger ones spooled
+ARCHIVE_PATTERN = re.compile(r'^(.*?\.(?:zip|tar|tar\.gz|tgz))(?:[/\\](.*))?$', re.IGNORECASE)
+
+_sources = {}  # archive path -> ArchiveSource
+_sources_lock = threading.Lock()
+
+
+class FileStat:
+    """The parts of os.stat_result the caches look at"""
+
+    def __init__(self, st_mtime_ns, st_size):
+        self.st_mtime_ns = st_mtime_ns
+        self.st_size = st_size
+
+
+class Entry:
+    """An archive member, shaped like os.DirEntry"""
+
+    def __init__(self, name, path, directory, stat):
+        self.name = name
+        self.path = path
+        self.directory = directory
+        self._stat = stat
+
+    def is_dir(self, follow_symlinks=True):
+        return self.directory
+
+    def is_file(self, follow_symlinks=True):
+        return not self.directory
+
+    def is_symlink(self):
+        return False
+
+    def stat(self):
+        return self._stat
+
+
+class ArchiveSource:
+    """Member index of one archive; subclasses open the archive and read members"""
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        stat = os.stat(archive_path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.children = {"": {}}  # member folder -> {name: size, or None for a folder}
+        self.lock = threading.Lock()
+
+    def add_member(self, name, size):
+        """Index one member, creating the folders above it"""
+        parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+        folder = ""
+        for depth, part in enumerate(parts):
+            last = depth == len(parts) - 1
+            self.children.setdefault(folder, {})
+            if last and size is not None:
+                self.children[folder][part] = size
+            else:
+                self.children[folder].setdefault(part, None)
+            folder = f"{folder}/{part}" if folder else part
+        if size is None:
+            self.children.setdefault(folder, {})
+
+    def scandir(self, path, member):
+        listing = self.children.get(member)
+        if listing is None:
+            raise FileNotFoundError(f"No such folder in {self.archive_path}: {member}")
+        return [
+            Entry(name, os.path.join(path, name), size is None, FileStat(self.signature[0], size or 0))
+            for name, size in listing.items()
+        ]
+
+    def stat(self, member):
+        folder, _, name = member.rpartition("/")
+        size = self.children.get(folder, {}).get(name, -1)
+        if size == -1:
+            raise FileNotFoundError(f"No such file in {self.archive_path}: {member}")
+        return FileStat(self.signature[0], size or 0)
+
+
+class ZipSource(ArchiveSource):
+    def __init__(self, archive_path):
+        import zipfile
+
+        super().__init__(archive_path)
+        self.archive = zipfile.ZipFile(archive_path)
+        for info in self.archive.infolist():
+            self.add_member(info.filename, None if info.is_dir() else info.file_size)
+
+    def open_binary(self, member):
+        try:
+            # ZipFile shares its one handle safely between threads
+            return self.archive.open(member)
+        except KeyError:
+            raise FileNotFoundError(f"No such file in {self.archive_path}: {member}") from None
+
+    def close(self):
+        self.archive.close()
+
+
+class TarSource(ArchiveSource):
+    def __init__(self, archive_path):
+        import tarfile
+
+        super().__init__(archive_path)
+        self.archive = tarfile.open(archive_path, "r:*")
+        self.members = {}
+        self.small = {}  # member -> bytes
+        self.spooled = {}  # member -> (offset, size) in self.spool
+        # A plain .tar seeks cheaply, so its members are read in place
+        self.spool = None if archive_path.lower().endswith(".tar") else tempfile.TemporaryFile(prefix="course-")
+        try:
+            for info in self.archive:
+                name = "/".join(part for part in info.name.replace("\\", "/").split("/") if part not in ("", "."))
+                if info.isdir():
+                    self.add_member(name, None)
+                elif info.isfile():
+                    self.add_member(name, info.size)
+                    self.members[name] = info
+                    if self.spool is not None:
+                        self.keep(name, info)
+        except BaseException:
+            self.close()
+            raise
+
+    def keep(self, name, info):
+        """Copy a member out while it is under the read position: free now, a re-decompression later"""
+        data = self.archive.extractfile(info)
+        if info.size <= SMALL_MEMBER_BYTES:
+            self.small[name] = data.read()
+        else:
+            self.spooled[name] = (self.spool.tell(), info.size)
+            shutil.copyfileobj(data, self.spool)
+
+    def open_binary(self, member):
+        info = self.members.get(member)
+        if info is None:
+            raise FileNotFoundError(f"No such file in {self.archive_path}: {member}")
+        if member in self.small:
+            return io.BytesIO(self.small[member])
+        with self.lock:
+            # One shared file position, so members are read whole
+            if member in self.spooled:
+                offset, size = self.spooled[member]
+                self.spool.seek(offset)
+                return io.BytesIO(self.spool.read(size))
+            return io.BytesIO(self.archive.extractfile(info).read())
+
+    def close(self):
+        self.archive.close()
+        if self.spool is not None:
+            self.spool.close()
+
+
+def split_archive_path(path):
+    """(archive path, member name) when path is an archive or lies inside one, else None"""
+    match = ARCHIVE_PATTERN.match(path)
+    if match is None:
+        return None
+    archive_path = match.group(1)
+    if archive_path not in _sources and not os.path.isfile(archive_path):
+        return None  # A folder that happens to be named like an archive
+    return archive_path, (match.group(2) or "").replace("\\", "/").strip("/")
+
+
+def archive_source(archive_path, refresh=False):
+    """The indexed source for archive_path, opened on first use (or when refresh finds it changed)"""
+    with _sources_lock:
+        source = _sources.get(archive_path)
+        if source is not None and refresh:
+            stat = os.stat(archive_path)
+            if source.signature != (stat.st_mtime_ns, stat.st_size):
+                source.close()
+                source = None
+        if source is None:
+            if archive_path.lower().endswith(".zip"):
+                source = ZipSource(archive_path)
+            else:
+                source = TarSource(archive_path)
+            _sources[archive_path] = source
+        return source
+
+
+def open_source(path):
+    """Get path ready to be scanned: an archive is (re-)indexed if it is new or has changed"""
+    split = split_archive_path(path)
+    if split is not None:
+        archive_source(split[0], refresh=True)
+
+
+def scandir(path):
+    """The entries of a folder as a list: os.DirEntry objects, or Entry for archive members"""
+    split = split_archive_path(path)
+    if split is None:
+        with os.scandir(path) as entries:
+            return list(entries)
+    return archive_source(split[0]).scandir(path, split[1])
+
+
+def stat(path):
+    split = split_archive_path(path)
+    if split is None:
+        return os.stat(path)
+    return archive_source(split[0]).stat(split[1])
+
+
+def open_binary(path):
+    split = split_archive_path(path)
+    if split is None:
+        return open(path, "rb")
+    return archive_source(split[0]).open_binary(split[1])
+
+
+def open_text(path):
+    split = split_archive_path(path)
+    if split is None:
+        return open(path, "r", encoding="utf-8")
+    return io.TextIOWrapper(archive_source(split[0]).open_binary(split[1]), encoding="utf-8")
+
+
+def read_bytes(path):
+    with open_binary(path) as f:
+        return f.read()
@@ -0,0 +1,102 @@
+"""Incremental course re-import.
+
+CourseSync keeps a snapshot of the course tree (the mtime and size of every
+task file and screenshot, per Day folder) along with the levels scanned from
+it. refresh() takes a new snapshot, which costs one directory listing per
+folder, and re-scans only the Day folders that were added or changed: their
+listings come from the snapshot walk and their questions are read on
+course_scanner's thread pool, as in a full scan. The returned CourseDiff tells the GUI which levels to add, remove or update, so
+unchanged levels and any manual edits in them are left alone.
+"""
+import course_scanner
+import discovery
+import tracing
+
+
+def snapshot_folder(full_path, rules=None):
+    """({relative file name: (mtime_ns, size)}, walk entries) for the task files and screenshots of one level folder
+
+    The walk entries are what course_scanner.listing_from_walk needs to list the folder without walking it again.
+    """
+    files = {}
+    walked = list(discovery.walk_level(full_path, rules))
+    for kind, relative_path, entry in walked:
+        stat = entry.stat()
+        files[relative_path] = (stat.st_mtime_ns, stat.st_size)
+    return files, walked
+
+
+def snapshot_course(base_path, rules=None):
+    """({folder path: (day_number, folder_name, files)}, {folder path: walk entries}) for every level folder
+
+    Both are in course order.
+    """
+    with tracing.span("snapshot_course"):
+        snapshot = {}
+        walks = {}
+        for day_number, day_folder, full_path in course_scanner.find_day_folders(base_path, rules):
+            try:
+                files, walks[full_path] = snapshot_folder(full_path, rules)
+            except OSError:
+                continue  # Vanished or unreadable; treated as removed
+            snapshot[full_path] = (day_number, day_folder, files)
+        return snapshot, walks
+
+
+class CourseDiff:
+    """What changed between two refreshes, by Day folder path"""
+
+    def __init__(self, added, removed, changed, order, initial):
+        self.initial = initial  # First refresh: everything counts as added
+        self.added = added  # {folder: level}
+        self.removed = removed  # {folder: previous level}
+        self.changed = changed  # {folder: (previous level, level)}
+        self.order = order  # Every current folder, in course order
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+
+class CourseSync:
+    def __init__(self, base_path, rules=None, max_workers=course_scanner.SCAN_WORKERS):
+        self.base_path = base_path  # One course root or a list of them
+        self.rules = rules
+        self.max_workers = max_workers
+        self.snapshot = {}
+        self.levels = {}  # folder -> level dict from course_scanner.scan_folders
+        self.refreshed = False
+
+    def refresh(self):
+        """Snapshot the course again and re-scan only the folders that differ; returns a CourseDiff"""
+        snapshot, walks = snapshot_course(self.base_path, self.rules)
+        stale = [
+            (day_number, day_folder, folder)
+            for folder, (day_number, day_folder, files) in snapshot.items()
+            if self.snapshot.get(folder) != (day_number, day_folder, files)
+        ]
+        with tracing.span("scan_changed_levels", folders=len(stale)):
+            listings = [course_scanner.listing_from_walk(walks[folder], self.rules) for _, _, folder in stale]
+            levels = course_scanner.scan_folders(stale, self.max_workers, self.rules, listings)
+
+        added, removed, changed = {}, {}, {}
+        for (_, _, folder), level in zip(stale, levels):
+            if folder in self.snapshot:
+                changed[folder] = (self.levels[folder], level)
+            else:
+                added[folder] = level
+            self.levels[folder] = level
+        for folder in self.snapshot:
+            if folder not in snapshot:
+                removed[folder] = self.levels.pop(folder)
+
+        initial = not self.refreshed
+        self.snapshot = snapshot
+        self.refreshed = True
+        order = list(snapshot)
+        return CourseDiff(added, removed, changed, order, initial)
+
+    def ordered_levels(self):
+        return [self.levels[folder] for folder in self.snapshot]
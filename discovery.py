@@ -0,0 +1,208 @@
+"""Course discovery rules: which folders are levels, which files are tasks, where screenshots live.
+
+DiscoveryRules holds the patterns; they are compiled once into a Matcher, so
+each directory entry costs one regex match however many patterns there are.
+Walks list every folder once with scandir (through course_source, so archives
+work too), skip ignored names, stop descending at level folders and screenshot
+folders, and sort each result once in natural order (Day2 before Day10).
+
+The defaults are the classic layout: DayN [Name] folders directly under the
+course root, N.M.py (or N-M.py) files directly in them and a Screenshots folder
+of N.M.png/.jpg/.jpeg. A discovery.json file overrides any of them:
+
+    {"roots": [".", "../extra"], "level_patterns": ["Day(\\\\d+)", "Week(\\\\d+)"],
+     "task_patterns": ["lab_\\\\d+_\\\\d+\\\\.ipynb", "\\\\d+[.-]\\\\d+.*\\\\.py"], "task_depth": 2}
+
+Level patterns match the start of a folder name, ignoring case. Task patterns
+must match a whole file name. Ignore patterns are shell wildcards.
+"""
+import fnmatch
+import json
+import os
+import re
+
+import course_source
+
+CONFIG_NAME = "discovery.json"
+DIGITS = re.compile(r'\d+')
+NEVER = re.compile(r'(?!)')
+
+
+def natural_key(name):
+    """Sort key that orders the numbers in a name numerically: "Day2" < "Day10", "1.2.py" < "1.10.py" """
+    return tuple(int(number) for number in DIGITS.findall(name)), name.lower()
+
+
+def combine(patterns, flags=0):
+    """One regex matching any of patterns"""
+    if not patterns:
+        return NEVER
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+
+class DiscoveryRules:
+    def __init__(self, level_patterns=(r'Day(\d+)(?:\s*\[.*\])?',), task_patterns=(r'(\d+)[\.\-](\d+).*\.py',),
+                 screenshot_folders=("Screenshots",), screenshot_extensions=(".png", ".jpg", ".jpeg"),
+                 ignore=(".*", "__pycache__", "node_modules", "venv"), level_depth=1, task_depth=1,
+                 follow_symlinks=True):
+        self.level_patterns = list(level_patterns)  # Regexes matched against the start of folder names
+        self.task_patterns = list(task_patterns)  # Regexes matched against whole file names
+        self.screenshot_folders = list(screenshot_folders)  # Folder names holding a level's screenshots
+        self.screenshot_extensions = list(screenshot_extensions)  # Earlier wins when a task has several
+        self.ignore = list(ignore)  # Wildcards for files and folders never looked at
+        self.level_depth = level_depth  # 1: level folders directly under a root
+        self.task_depth = task_depth  # 1: task files directly in the level folder
+        self.follow_symlinks = follow_symlinks
+        self._matcher = None
+
+    def settings(self):
+        return {key: value for key, value in vars(self).items() if not key.startswith("_")}
+
+    def __eq__(self, other):
+        return isinstance(other, DiscoveryRules) and self.settings() == other.settings()
+
+    def matcher(self):
+        """The compiled Matcher, built on first use"""
+        if self._matcher is None:
+            self._matcher = Matcher(self)
+        return self._matcher
+
+
+class Matcher:
+    """DiscoveryRules compiled for walking"""
+
+    def __init__(self, rules):
+        self.level = combine(rules.level_patterns, re.IGNORECASE)
+        self.task = combine(rules.task_patterns)
+        self.ignore = combine([fnmatch.translate(pattern) for pattern in rules.ignore])
+        self.screenshot_folders = frozenset(rules.screenshot_folders)
+        self.screenshot_ranks = {ext.lower(): rank for rank, ext in reversed(list(enumerate(rules.screenshot_extensions)))}
+        self.level_depth = rules.level_depth
+        self.task_depth = rules.task_depth
+        self.follow_symlinks = rules.follow_symlinks
+
+    def is_dir(self, entry):
+        return entry.is_dir(follow_symlinks=self.follow_symlinks)
+
+    def first_visit(self, entry, root, visited):
+        """False for a symlinked folder that is walked anyway, so links can't loop or repeat a folder
+
+        That is a link into the tree under root (walked without it), above root (a loop) or to a
+        folder another link already led to. Only symlinks pay for the realpath.
+        """
+        if not (self.follow_symlinks and entry.is_symlink()):
+            return True
+        target = os.path.realpath(entry.path)
+        real_root = os.path.realpath(root)
+        if target in visited or os.path.commonpath([target, real_root]) in (target, real_root):
+            return False
+        visited.add(target)
+        return True
+
+    def screenshot_rank(self, name):
+        """Preference of a screenshot file name (lower is better), or None if it isn't one"""
+        return self.screenshot_ranks.get(os.path.splitext(name)[1].lower())
+
+
+DEFAULT_RULES = DiscoveryRules()
+
+
+def load_config(path):
+    """(roots, DiscoveryRules) from a discovery.json; roots are relative to its folder, default just that folder
+
+    Raises OSError if it can't be read and ValueError if it isn't valid.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must hold a JSON object")
+    folder = os.path.dirname(os.path.abspath(path))
+    roots = [os.path.normpath(os.path.join(folder, root)) for root in config.pop("roots", ["."])]
+    unknown = set(config) - set(DEFAULT_RULES.settings())
+    if unknown:
+        raise ValueError(f"{path}: unknown setting(s) {', '.join(sorted(unknown))}")
+    try:
+        rules = DiscoveryRules(**config)
+        rules.matcher()  # Report bad patterns now, not halfway through a scan
+    except (TypeError, re.error) as e:
+        raise ValueError(f"{path}: {e}") from None
+    return roots, rules
+
+
+def root_list(roots):
+    if isinstance(roots, str):
+        roots = [roots]
+    return [os.path.normpath(root) for root in roots]
+
+
+def find_level_folders(roots, rules=None):
+    """(number, folder name, path) for every level folder: roots in order, each root's levels in natural order
+
+    number is the first number in the folder name (its position when it has none).
+    """
+    matcher = (rules or DEFAULT_RULES).matcher()
+    found = []
+    seen = set()
+    visited = set()
+    for root in root_list(roots):
+        course_source.open_source(root)  # Index an archive course once, or again if it changed
+        levels = []
+        stack = [(root, 1)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                entries = course_source.scandir(path)
+            except OSError:
+                if path == root:
+                    raise
+                continue  # Unreadable subfolder
+            for entry in entries:
+                if matcher.ignore.match(entry.name) or not matcher.is_dir(entry):
+                    continue
+                if matcher.level.match(entry.name):
+                    if entry.path not in seen:  # Overlapping roots
+                        seen.add(entry.path)
+                        levels.append((natural_key(entry.name), entry.name, entry.path))
+                elif depth < matcher.level_depth and matcher.first_visit(entry, root, visited):
+                    stack.append((entry.path, depth + 1))
+        levels.sort()
+        found.extend(levels)
+    return [
+        (key[0][0] if key[0] else position, name, path)
+        for position, (key, name, path) in enumerate(found, start=1)
+    ]
+
+
+def walk_level(full_path, rules=None):
+    """("task" or "screenshot", path relative to full_path, entry) for every task file and screenshot of one level
+
+    Raises OSError if full_path itself can't be listed.
+    """
+    matcher = (rules or DEFAULT_RULES).matcher()
+    visited = set()
+    stack = [(full_path, "", 1)]
+    while stack:
+        path, prefix, depth = stack.pop()
+        try:
+            entries = course_source.scandir(path)
+        except OSError:
+            if path == full_path:
+                raise
+            continue
+        for entry in entries:
+            name = entry.name
+            if matcher.ignore.match(name):
+                continue
+            if matcher.task.fullmatch(name):
+                if entry.is_file():
+                    yield "task", os.path.join(prefix, name), entry
+            elif name in matcher.screenshot_folders and matcher.is_dir(entry):
+                try:
+                    shots = course_source.scandir(entry.path)
+                except OSError:
+                    continue
+                for shot in shots:
+                    if matcher.screenshot_rank(shot.name) is not None and shot.is_file():
+                        yield "screenshot", os.path.join(prefix, name, shot.name), shot
+            elif depth < matcher.task_depth and matcher.is_dir(entry) and matcher.first_visit(entry, full_path, visited):
+                stack.append((entry.path, os.path.join(prefix, name), depth + 1))
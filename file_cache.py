@@ -0,0 +1,90 @@
+"""Shared, size-capped cache of solution file contents.
+
+Entries are validated against the file's mtime and size on every lookup, so an
+edited file is re-read while an unchanged one costs a single stat(). The least
+recently used entries are dropped once the cache holds more than max_chars.
+"""
+import threading
+from collections import OrderedDict
+
+import course_source
+import tracing
+
+DEFAULT_MAX_CHARS = 64 * 1024 * 1024
+PREVIEW_CHARS = 20000  # Enough for the preview box; huge files are cut here
+
+
+def truncate(text, max_chars, file_size):
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + f"\n\n... (preview truncated, file is {file_size // 1024} KB)"
+
+
+class SourceCache:
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS):
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self._entries = OrderedDict()  # (path, kind) -> (mtime_ns, size, text)
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, stat):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                return entry[2]
+        return None
+
+    def _store(self, key, stat, text):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_chars -= len(old[2])
+            if len(text) > self.max_chars:
+                return  # Never worth evicting everything else for
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, text)
+            self.total_chars += len(text)
+            while self.total_chars > self.max_chars:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.total_chars -= len(evicted)
+
+    def get_text(self, path):
+        """Full file contents; raises OSError/UnicodeDecodeError like open() would"""
+        stat = course_source.stat(path)
+        text = self._lookup((path, "full"), stat)
+        if text is None:
+            with course_source.open_text(path) as file:
+                text = file.read()
+            tracing.count("bytes_read", len(text))
+            self._store((path, "full"), stat, text)
+        return text
+
+    def get_preview(self, path, max_chars=PREVIEW_CHARS):
+        """File contents cut to max_chars, without reading the rest of a huge file"""
+        stat = course_source.stat(path)
+        text = self._lookup((path, "full"), stat)
+        if text is not None:
+            return truncate(text, max_chars, stat.st_size)
+        preview = self._lookup((path, "preview"), stat)
+        if preview is not None:
+            return preview
+
+        with course_source.open_text(path) as file:
+            text = file.read(max_chars + 1)
+        tracing.count("bytes_read", len(text))
+        if len(text) <= max_chars:
+            # Small file: the preview is the whole file
+            self._store((path, "full"), stat, text)
+            return text
+        preview = truncate(text, max_chars, stat.st_size)
+        self._store((path, "preview"), stat, preview)
+        return preview
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_chars = 0
+
+
+# Process-wide instance used by the GUI previews and the report engine
+source_cache = SourceCache()
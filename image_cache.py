@@ -0,0 +1,157 @@
+"""Screenshot preparation for PDF embedding.
+
+Screenshots are downsampled to the resolution they will actually be printed at
+and re-encoded (JPEG, or PNG flattened onto white) before they reach ReportLab.
+Results live in an on-disk cache keyed by the source path, mtime, size and the
+preparation settings, so an unchanged report re-uses them without decoding the
+source images again. The prepared files themselves are content-addressed, which
+lets ReportLab write each distinct image into the PDF only once.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+
+from PIL import Image
+
+import course_source
+import tracing
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "report_maker_image_cache")
+IMAGE_FORMATS = ("JPEG", "PNG")
+POINTS_PER_INCH = 72.0
+
+
+def fit_size(width, height, max_width, max_height):
+    """Scale (width, height) down uniformly so it fits in the box; never scales up"""
+    scale = min(1.0, max_width / width, max_height / height)
+    return width * scale, height * scale
+
+
+def temp_path_for(path):
+    """Unique sibling path for write-then-rename, safe across processes and threads"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def flatten(img):
+    """Convert to RGB, compositing any transparency onto a white background"""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+class PreparedImage:
+    """A ready-to-embed image file plus the size (in points) it should be drawn at"""
+
+    def __init__(self, path, width, height):
+        self.path = path
+        self.width = width
+        self.height = height
+
+
+class ImagePreparer:
+    """Downsamples and re-encodes screenshots, caching the results on disk"""
+
+    def __init__(self, cache_dir=None, dpi=150, image_format="JPEG", quality=85):
+        image_format = image_format.upper()
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format {image_format!r}, expected one of {IMAGE_FORMATS}")
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.dpi = dpi
+        self.image_format = image_format
+        self.quality = quality
+        self.extension = ".jpg" if image_format == "JPEG" else ".png"
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def settings_key(self, box_width, box_height):
+        return f"{round(box_width, 2)}|{round(box_height, 2)}|{self.dpi}|{self.image_format}|{self.quality}"
+
+    def cache_key(self, path, box_width, box_height):
+        stat = course_source.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.settings_key(box_width, box_height)}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def prepare(self, path, box_width, box_height):
+        """Return a PreparedImage for path, drawn at most box_width x box_height points
+
+        Prepared files are named by a hash of the source content, so identical screenshots
+        (even at different paths) share one file and ReportLab embeds them once.
+        """
+        key = self.cache_key(path, box_width, box_height)
+        meta_path = os.path.join(self.cache_dir, key + ".json")
+        cached = self.cached(meta_path)
+        if cached is not None:
+            return cached
+
+        data = course_source.read_bytes(path)
+        content_hash = hashlib.sha1(data)
+        content_hash.update(self.settings_key(box_width, box_height).encode("utf-8"))
+        output_path = os.path.join(self.cache_dir, content_hash.hexdigest() + self.extension)
+
+        prepared = self.render(data, output_path, box_width, box_height)
+        self.write_atomic(meta_path, json.dumps(
+            {"path": prepared.path, "width": prepared.width, "height": prepared.height}
+        ).encode("utf-8"))
+        return prepared
+
+    def cached(self, meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if os.path.exists(meta["path"]):
+                return PreparedImage(meta["path"], meta["width"], meta["height"])
+        except (OSError, ValueError, KeyError):
+            pass  # Cache miss
+        return None
+
+    def measure(self, path, box_width, box_height):
+        """Drawn (width, height) of path without preparing it: from the cache, else the file header"""
+        key = self.cache_key(path, box_width, box_height)
+        cached = self.cached(os.path.join(self.cache_dir, key + ".json"))
+        if cached is not None:
+            return cached.width, cached.height
+        with course_source.open_binary(path) as f, Image.open(f) as img:
+            return fit_size(img.width, img.height, box_width, box_height)
+
+    def render(self, data, output_path, box_width, box_height):
+        with Image.open(io.BytesIO(data)) as img:
+            # Screenshots are laid out at one point per pixel, shrunk to fit the printed box
+            width, height = fit_size(img.width, img.height, box_width, box_height)
+            if os.path.exists(output_path):
+                # Same content already prepared from another path: only the header was read
+                return PreparedImage(output_path, width, height)
+
+            target = (
+                max(1, min(img.width, round(width / POINTS_PER_INCH * self.dpi))),
+                max(1, min(img.height, round(height / POINTS_PER_INCH * self.dpi))),
+            )
+            with tracing.span("decode_image"):
+                if img.format == "JPEG":
+                    img.draft("RGB", target)  # Let libjpeg decode at a reduced scale
+                img.load()
+                tracing.count("image_pixels", img.width * img.height)
+                img = flatten(img)
+            with tracing.span("encode_image"):
+                if img.size != target:
+                    img = img.resize(target, Image.LANCZOS)
+
+                tmp_path = temp_path_for(output_path)
+                if self.image_format == "JPEG":
+                    img.save(tmp_path, "JPEG", quality=self.quality, optimize=True)
+                else:
+                    img.save(tmp_path, "PNG", optimize=True)
+                os.replace(tmp_path, output_path)
+        return PreparedImage(output_path, width, height)
+
+    def write_atomic(self, path, data):
+        tmp_path = temp_path_for(path)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
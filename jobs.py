@@ -0,0 +1,115 @@
+"""Report job scheduler for the GUI.
+
+Jobs wait in a queue and run on a small, bounded thread pool. Everything a job
+reports (queued, started, progress per level and task, done, failed, cancelled)
+is published as a JobEvent on a thread-safe queue; the GUI drains it with an
+after() poll, so widgets are only ever touched from the Tk thread. A running job
+is cancelled at its next progress report. No tkinter in here, and the report
+engine (with reportlab) is only imported once the first job runs.
+"""
+import itertools
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# kind is one of "queued", "started", "progress", "done", "failed", "cancelled";
+# result is the PDF path for "done" and the exception for "failed"
+JobEvent = namedtuple("JobEvent", "job_id name kind fraction message result")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class ReportJob:
+    def __init__(self, job_id, report_data, save_path, options=None):
+        self.id = job_id
+        self.report_data = report_data
+        self.save_path = save_path
+        self.options = options
+        self.name = report_data.get("skill_name", "")
+        self.state = "queued"
+        self.cancel_event = threading.Event()
+
+
+class JobScheduler:
+    """Runs report jobs max_workers at a time and publishes their JobEvents on self.events"""
+
+    def __init__(self, max_workers=1):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._ids = itertools.count(1)
+        self.events = queue.Queue()
+        self.jobs = {}  # id -> ReportJob, until the job finishes
+        self._lock = threading.Lock()
+
+    def submit(self, report_data, save_path, options=None):
+        """Queue a report and return its ReportJob"""
+        job = ReportJob(next(self._ids), report_data, save_path, options)
+        with self._lock:
+            self.jobs[job.id] = job
+        self._publish(job, "queued", 0.0, "Queued")
+        self._pool.submit(self._run, job)
+        return job
+
+    def cancel(self, job_id):
+        """Ask a queued or running job to stop; returns False if it already finished"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def cancel_all(self):
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+
+    def active_count(self):
+        """Jobs queued or running; their final events are published before they stop counting"""
+        with self._lock:
+            return len(self.jobs)
+
+    def poll(self):
+        """Every event published since the last poll, oldest first (call from the Tk thread)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _publish(self, job, kind, fraction, message, result=None):
+        self.events.put(JobEvent(job.id, job.name, kind, fraction, message, result))
+
+    def _run(self, job):
+        import report_engine
+
+        def progress(fraction, message):
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+            self._publish(job, "progress", fraction, message)
+
+        try:
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+            job.state = "running"
+            self._publish(job, "started", 0.0, "Started")
+            full_path = report_engine.generate_pdf_report(job.report_data, job.save_path, progress, job.options)
+            job.state = "done"
+            self._publish(job, "done", 1.0, "Done", full_path)
+        except JobCancelled:
+            job.state = "cancelled"
+            self._publish(job, "cancelled", 0.0, "Cancelled")
+        except Exception as e:
+            job.state = "failed"
+            self._publish(job, "failed", 0.0, str(e), e)
+        finally:
+            with self._lock:
+                del self.jobs[job.id]
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,86 @@
+"""Render a report's levels in parallel worker processes and merge the fragments.
+
+A cheap layout-only pass (no drawing, image sizes read from file headers)
+works out where on the page every segment starts. Contiguous groups of
+segments are then rendered to their own PDF fragments in a process pool,
+each starting at its measured position, and stitched together by pdf_merge.
+If a fragment does not end where the layout pass said the next one starts,
+the caller falls back to a serial render, so the output is always identical.
+Requires pypdf.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import report_engine
+from pdf_merge import merge_fragments, require_pypdf
+
+GROUPS_PER_WORKER = 2
+
+
+def group_segments(segments, group_count):
+    """Split segments into at most group_count contiguous lists of similar weight"""
+    total = sum(segment.weight() for segment in segments)
+    target = total / max(1, group_count)
+    groups, current, weight = [], [], 0
+    for segment in segments:
+        current.append(segment)
+        weight += segment.weight()
+        if weight >= target * (len(groups) + 1) and len(groups) < group_count - 1:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    return groups
+
+
+def render_group(path, start_y, segments, options):
+    """Worker entry point: draw one group of segments to its own fragment"""
+    return report_engine.render_fragment(path, start_y, segments, options)
+
+
+def render_parallel(segments, full_path, title, options, progress_callback=None):
+    """Render segments to full_path with options.parallel_workers processes
+
+    Returns False, without writing full_path, if the fragments don't line up with
+    the layout pass; the caller should then render serially.
+    """
+    require_pypdf()
+    workers = options.parallel_workers
+    positions = report_engine.measure_segments(segments, options)
+    groups = group_segments(segments, workers * GROUPS_PER_WORKER)
+    starts = []
+    index = 0
+    for group in groups:
+        starts.append(positions[index][0])
+        index += len(group)
+
+    fragment_dir = tempfile.mkdtemp(prefix=".fragments-", dir=os.path.dirname(full_path) or ".")
+    try:
+        paths = [os.path.join(fragment_dir, f"{k:04d}.pdf") for k in range(len(groups))]
+        end_ys = [None] * len(groups)
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            futures = {
+                pool.submit(render_group, paths[k], starts[k], group, options): k
+                for k, group in enumerate(groups)
+            }
+            done = 0
+            for future in as_completed(futures):
+                k = futures[future]
+                end_ys[k], _ = future.result()
+                done += 1
+                if progress_callback:
+                    progress_callback(done / len(groups) * 0.95, f"Rendered {groups[k][-1].name}")
+
+        for k in range(len(groups) - 1):
+            if round(end_ys[k], 3) != round(starts[k + 1], 3):
+                print(f"Layout pass disagreed at {groups[k + 1][0].name}; rendering serially")
+                return False
+
+        if progress_callback:
+            progress_callback(0.97, "Merging fragments")
+        merge_fragments(paths, full_path, title)
+        return True
+    finally:
+        shutil.rmtree(fragment_dir, ignore_errors=True)
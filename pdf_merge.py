@@ -0,0 +1,214 @@
+"""Stitch separately rendered PDF fragments into one report.
+
+Fragments are rendered with absolute page coordinates, so a fragment that starts
+part-way down a page is merged by overlaying its first page onto the last page
+produced so far; the result looks exactly like a single-canvas render.
+
+Fragments that each start on a fresh page (the streaming renderer's chunks) are
+joined by concatenate_fragments instead, which copies one fragment at a time
+straight to the output file: only the open fragment and a digest per written
+object are held, never the whole document. Requires pypdf.
+"""
+import gc
+import hashlib
+import io
+import os
+
+import tracing
+
+
+def require_pypdf():
+    try:
+        import pypdf
+    except ImportError:
+        raise RuntimeError("Merging report fragments needs pypdf: pip install pypdf") from None
+    return pypdf
+
+
+def merge_fragments(fragment_paths, output_path, title=None, continued=None):
+    """Write fragment_paths to output_path in order and return the page count
+
+    continued[k] says whether fragment k's first page continues the previous page
+    (default: every fragment but the first does).
+    """
+    with tracing.span("merge_fragments", fragments=len(fragment_paths)):
+        return write_merged(fragment_paths, output_path, title, continued)
+
+
+def concatenate_fragments(fragment_paths, output_path, title=None):
+    """Write the pages of fragment_paths to output_path in order and return the page count
+
+    Each fragment's pages must start on a fresh page; nothing is overlaid.
+    """
+    with tracing.span("concatenate_fragments", fragments=len(fragment_paths)):
+        pypdf = require_pypdf()
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer = ObjectWriter(f)
+            for k, path in enumerate(fragment_paths):
+                with open(path, "rb") as fragment:
+                    reader = pypdf.PdfReader(fragment)  # Reads from the file, not a copy of it in memory
+                    if k == 0:
+                        writer.start(reader, title)
+                    writer.copy_pages(reader)
+                del reader
+                gc.collect()  # pypdf objects point back at their reader: only the cycle collector frees a fragment
+            writer.finish()
+        os.replace(tmp_path, output_path)
+        return len(writer.page_numbers)
+
+
+class ObjectWriter:
+    """Writes PDF objects to a file as they are copied, one source document at a time
+
+    Objects are renumbered into one sequence; identical objects (fonts, the
+    placeholder image, repeated screenshots) are written once, by content digest.
+    """
+
+    INHERITED = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")  # Page attributes a page tree node can hold
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = [0]  # Output object number -> byte offset; 0 heads the free list
+        self.digests = {}  # Digest of an object's bytes -> output object number
+        self.page_numbers = []
+        self.pages_number = self.reserve()
+        self.info_number = None
+        self.numbers = {}  # Source object number -> output object number, for the open fragment
+        self.in_progress = set()
+
+    def reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def write_object(self, number, *parts):
+        self.offsets[number] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % number)
+        for part in parts:
+            self.f.write(part)
+        self.f.write(b"\nendobj\n")
+
+    def start(self, reader, title):
+        """Write the file header and the document information, taken from the first fragment"""
+        self.f.write(reader.pdf_header.encode("latin-1") + b"\n%\xe2\xe3\xcf\xd3\n")
+        info = dict(reader.metadata or {})
+        if title:
+            from pypdf.generic import NameObject, TextStringObject
+
+            info[NameObject("/Title")] = TextStringObject(title)
+        self.info_number = self.reserve()
+        self.write_object(self.info_number, self.serialize(info))
+
+    def copy_pages(self, reader):
+        self.numbers = {}
+        self.in_progress = set()
+        for page in reader.pages:
+            entries = dict(page)
+            parent = page.get("/Parent")
+            while parent is not None:
+                # Page tree nodes all become our single /Pages node
+                self.numbers[parent.idnum] = self.pages_number
+                node = parent.get_object()
+                for key in self.INHERITED:
+                    if key not in entries and key in node:
+                        entries[key] = node[key]
+                parent = node.get("/Parent")
+            number = self.reserve()
+            self.numbers[page.indirect_reference.idnum] = number  # Before its children, which may point back
+            self.write_object(number, self.serialize(entries))
+            self.page_numbers.append(number)
+
+    def finish(self):
+        kids = b" ".join(b"%d 0 R" % number for number in self.page_numbers)
+        self.write_object(self.pages_number, b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(self.page_numbers), kids))
+        root = self.reserve()
+        self.write_object(root, b"<< /Type /Catalog /Pages %d 0 R >>" % self.pages_number)
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.offsets))
+        self.f.write(b"".join(b"%010d 00000 n \n" % offset for offset in self.offsets[1:]))
+        self.f.write(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                     % (len(self.offsets), root, self.info_number, xref))
+
+    def reference(self, indirect):
+        """Output number of a source object, copying it (and what it refers to) on first use"""
+        number = self.numbers.get(indirect.idnum)
+        if number is not None:
+            return number
+        if indirect.idnum in self.in_progress:
+            # A reference cycle: give the object its number now and write it when it is done
+            number = self.numbers[indirect.idnum] = self.reserve()
+            return number
+        from pypdf.generic import StreamObject
+
+        self.in_progress.add(indirect.idnum)
+        obj = indirect.get_object()
+        if isinstance(obj, StreamObject):
+            data = obj._data  # Still encoded: copied as is, without a joined copy of the object
+            entries = self.serialize_entries((key, value) for key, value in obj.items() if key != "/Length")
+            parts = (b"<< %s /Length %d >>\nstream\n" % (entries, len(data)), data, b"\nendstream")
+        else:
+            parts = (self.serialize(obj),)
+        self.in_progress.discard(indirect.idnum)
+        number = self.numbers.get(indirect.idnum)
+        if number is None:
+            digest = hashlib.sha256()
+            for part in parts:
+                digest.update(part)
+            key = digest.digest()
+            number = self.digests.get(key)
+            if number is None:
+                number = self.digests[key] = self.reserve()
+                self.write_object(number, *parts)
+            self.numbers[indirect.idnum] = number
+        else:
+            self.write_object(number, *parts)
+        return number
+
+    def serialize(self, obj):
+        """PDF bytes of a direct object, with references renumbered"""
+        from pypdf.generic import ArrayObject, IndirectObject
+
+        if isinstance(obj, IndirectObject):
+            return b"%d 0 R" % self.reference(obj)
+        if isinstance(obj, dict):
+            return b"<< %s >>" % self.serialize_entries(obj.items())
+        if isinstance(obj, ArrayObject):
+            return b"[ %s ]" % b" ".join(self.serialize(item) for item in obj)
+        return self.serialize_direct(obj)
+
+    def serialize_entries(self, items):
+        return b" ".join(self.serialize_direct(key) + b" " + self.serialize(value) for key, value in items)
+
+    @staticmethod
+    def serialize_direct(obj):
+        out = io.BytesIO()
+        obj.write_to_stream(out)
+        return out.getvalue()
+
+
+def write_merged(fragment_paths, output_path, title, continued):
+    pypdf = require_pypdf()
+    if continued is None:
+        continued = [k > 0 for k in range(len(fragment_paths))]
+
+    writer = pypdf.PdfWriter()
+    for path, continues in zip(fragment_paths, continued):
+        pages = pypdf.PdfReader(path).pages
+        first = 0
+        if continues and len(writer.pages) and len(pages):
+            writer.pages[-1].merge_page(pages[0])
+            first = 1
+        for page in pages[first:]:
+            writer.add_page(page)
+
+    if title:
+        writer.add_metadata({"/Title": title})
+    if hasattr(writer, "compress_identical_objects"):
+        # Images shared between fragments (e.g. the placeholder) are kept once
+        writer.compress_identical_objects()
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    os.replace(tmp_path, output_path)
+    return len(writer.pages)
@@ -0,0 +1,136 @@
+"""Project files: everything entered in the GUI, saved so a session can be resumed.
+
+A project is compact JSON holding the user info, skill name, save location and
+every level and task. It keeps file and image references, never code text or
+pixels, each with a content hash taken at save time, so it opens instantly
+however big the course is and stale references can be spotted later. The GUI
+pulls code and thumbnails only when a task is shown, and the headless engine
+renders a project directly (python -m report_engine --project course.srproj).
+"""
+import hashlib
+import json
+import os
+import threading
+
+import course_source
+
+FORMAT = "skill-report-project"
+VERSION = 1
+EXTENSION = ".srproj"
+
+_hash_cache = {}  # path -> (mtime_ns, size, sha1)
+_hash_lock = threading.Lock()
+
+
+def file_hash(path):
+    """sha1 of path's contents, or None if it can't be read; cached by (mtime, size)"""
+    if not path:
+        return None
+    try:
+        stat = course_source.stat(path)
+        with _hash_lock:
+            cached = _hash_cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.sha1()
+        with course_source.open_binary(path) as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    with _hash_lock:
+        _hash_cache[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def solution_path(level, task):
+    if not level.get("folder") or not task.get("solution_file"):
+        return None
+    return os.path.join(level["folder"], task["solution_file"])
+
+
+def build_project(report_data, save_location=""):
+    """Project dict for report_data (as built by the GUI), hashing every referenced file"""
+    levels = []
+    for level in report_data["levels"]:
+        tasks = []
+        for task in level["tasks"]:
+            tasks.append({
+                "task": task.get("task", ""),
+                "solution_file": task.get("solution_file", ""),
+                "image_path": task.get("image_path"),
+                "code_hash": file_hash(solution_path(level, task)),
+                "image_hash": file_hash(task.get("image_path")),
+            })
+        levels.append({"level_name": level.get("level_name", ""), "folder": level.get("folder", ""), "tasks": tasks})
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "skill_name": report_data.get("skill_name", ""),
+        "user_name": report_data.get("user_name", ""),
+        "user_role": report_data.get("user_role", ""),
+        "save_location": save_location,
+        "levels": levels,
+    }
+
+
+def save_project(path, project):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(project, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_project(path):
+    """Read a project file; only the level and task index is loaded, nothing it references"""
+    with open(path, "r", encoding="utf-8") as f:
+        project = json.load(f)
+    if not isinstance(project, dict) or project.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a Skill Report project")
+    if project.get("version", 0) > VERSION:
+        raise ValueError(f"{path} was saved by a newer version (format {project['version']})")
+    return project
+
+
+def report_data_from_project(project):
+    """report_data for report_engine.generate_pdf_report; code is read when each task is rendered"""
+    return {
+        "skill_name": project["skill_name"],
+        "user_name": project.get("user_name", ""),
+        "user_role": project.get("user_role", ""),
+        "levels": [
+            {
+                "level_name": level["level_name"],
+                "folder": level["folder"],
+                "tasks": [
+                    {"task": task["task"], "solution_file": task["solution_file"], "image_path": task.get("image_path")}
+                    for task in level["tasks"]
+                ],
+            }
+            for level in project["levels"]
+        ],
+    }
+
+
+def stale_references(project):
+    """(level name, file path, "missing" or "changed") for references whose content differs from the save"""
+    stale = []
+    for level in project["levels"]:
+        for task in level["tasks"]:
+            for path, saved in ((solution_path(level, task), task.get("code_hash")),
+                                (task.get("image_path"), task.get("image_hash"))):
+                if not path or saved is None:
+                    continue
+                current = file_hash(path)
+                if current != saved:
+                    stale.append((level["level_name"], path, "missing" if current is None else "changed"))
+    return stale
+
+
+def describe_stale(stale, limit=10):
+    """Warning text for stale_references results, listing at most limit of them"""
+    lines = [f"{len(stale)} referenced file(s) changed since the project was saved:"]
+    lines += [f"  {level_name}: {path} ({state})" for level_name, path, state in stale[:limit]]
+    if len(stale) > limit:
+        lines.append(f"  ...and {len(stale) - limit} more")
+    return "\n".join(lines)
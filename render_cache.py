@@ -0,0 +1,107 @@
+"""Per-level render cache for incremental report regeneration.
+
+Every segment of a report (the header, each level, the user info block) is
+rendered to its own PDF fragment and remembered in a manifest next to the output
+PDF, keyed by a fingerprint of everything that affects how it looks: its text,
+code and image content hashes, the rendering options, and the height on the page
+at which it starts. On the next run only segments whose fingerprint changed are
+rendered again; the rest are spliced in from the cache.
+"""
+import hashlib
+import json
+import os
+
+from pdf_merge import merge_fragments, require_pypdf
+
+# Bump when the layout code changes so old fragments are not reused
+RENDER_VERSION = 1
+
+
+def cache_dir_for(full_path):
+    folder, name = os.path.split(full_path)
+    return os.path.join(folder, f".{name}.levels")
+
+
+def fingerprint(description, options_key, start_y):
+    payload = json.dumps(
+        {"version": RENDER_VERSION, "options": options_key, "start_y": round(start_y, 3), "segment": description},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Fragment files plus a manifest of fingerprint -> {file, end_y, pages}"""
+
+    def __init__(self, full_path):
+        self.cache_dir = cache_dir_for(full_path)
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.used = set()
+
+    def fragment_path(self, key):
+        return os.path.join(self.cache_dir, key + ".pdf")
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and os.path.exists(self.fragment_path(key)):
+            self.used.add(key)
+            return entry
+        return None
+
+    def store(self, key, end_y, pages):
+        self.entries[key] = {"end_y": end_y, "pages": pages}
+        self.used.add(key)
+        return self.entries[key]
+
+    def save(self):
+        """Write the manifest, dropping fragments this run didn't use"""
+        for key in list(self.entries):
+            if key not in self.used:
+                del self.entries[key]
+        for name in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(name)
+            if ext == ".pdf" and key not in self.used:
+                os.remove(os.path.join(self.cache_dir, name))
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def render_incremental(segments, full_path, title, options, page_top, render_fragment, progress_callback=None):
+    """Render segments to full_path, re-using cached fragments; returns (rendered, reused) counts
+
+    The first segment starts at page_top. render_fragment(path, start_y, segment) must draw
+    the segment on a fresh canvas starting at start_y and return (end_y, page_count).
+    """
+    require_pypdf()
+    cache = RenderCache(full_path)
+    image_preparer = options.image_preparer()
+    options_key = options.fingerprint()
+
+    fragments = []
+    rendered = reused = 0
+    start_y = page_top
+    for segment in segments:
+        key = fingerprint(segment.describe(image_preparer), options_key, start_y)
+        entry = cache.lookup(key)
+        if entry is None:
+            end_y, pages = render_fragment(cache.fragment_path(key), start_y, segment)
+            entry = cache.store(key, end_y, pages)
+            rendered += 1
+        else:
+            reused += 1
+            if progress_callback:
+                progress_callback(segment.fraction, f"{segment.name}: unchanged")
+        fragments.append(cache.fragment_path(key))
+        start_y = entry["end_y"]
+
+    merge_fragments(fragments, full_path, title)
+    cache.save()
+    return rendered, reused
@@ -0,0 +1,780 @@
+"""Headless PDF report engine.
+
+Renders the same ``report_data`` structure the GUI builds into a PDF without
+touching tkinter, so reports can be generated from scripts, build boxes or the
+command line:
+
+    python -m report_engine --skill Python --course path/to/course --output reports/
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Paragraph
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+import course_scanner
+import course_source
+import discovery
+import project
+import tracing
+from code_block import draw_code_block
+from file_cache import source_cache
+from image_cache import ImagePreparer, PreparedImage, IMAGE_FORMATS
+from resources import placeholder_image_path, report_styles
+
+PAGE_TOP = letter[1] - inch
+# Images are drawn 0.3 inch below the cursor, inside this box (points)
+IMAGE_OFFSET = 0.05 * inch * (72/12)
+IMAGE_BOX = (letter[0] - 2 * inch, letter[1] - 2 * inch - IMAGE_OFFSET)
+# Wrapped paragraphs kept per renderer; repeated labels and spacers are wrapped once
+PARAGRAPH_CACHE_SIZE = 10000
+TOC_LEADING = 16
+TOC_TITLE_SPACE = 48
+OUTLINE_TITLE_CHARS = 80
+
+
+class ReportOptions:
+    """Tunable settings for generate_pdf_report"""
+
+    def __init__(self, image_dpi=150, image_format="JPEG", image_quality=85, image_cache_dir=None,
+                 code_line_numbers=False, code_wrap=True, incremental=False, parallel_workers=0,
+                 stream=False, memory_limit_mb=64, table_of_contents=False, outline=False, prefetch_depth=4):
+        self.image_dpi = image_dpi
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.image_cache_dir = image_cache_dir
+        self.code_line_numbers = code_line_numbers
+        self.code_wrap = code_wrap
+        self.incremental = incremental  # Re-render only changed levels (needs pypdf)
+        self.parallel_workers = parallel_workers  # Render level groups in worker processes (needs pypdf)
+        self.stream = stream  # Bounded memory: flush pages to disk as they fill up (needs pypdf)
+        self.memory_limit_mb = memory_limit_mb  # Image and code data held before flushing, when streaming
+        self.table_of_contents = table_of_contents  # Contents page(s) with links, laid out in a measuring pass
+        self.outline = outline  # PDF bookmarks: levels -> tasks
+        self.prefetch_depth = prefetch_depth  # Tasks whose code and image load ahead on threads (0: off)
+
+    def image_preparer(self):
+        return ImagePreparer(self.image_cache_dir, self.image_dpi, self.image_format, self.image_quality)
+
+    def fingerprint(self):
+        """The settings that change how a page looks, for render caches"""
+        return [self.image_dpi, self.image_format, self.image_quality, self.code_line_numbers, self.code_wrap]
+
+
+def report_filename(skill_name):
+    return f"Skill_{skill_name}_Report.pdf"
+
+
+def read_code(folder, solution_file, cached=True):
+    """Read a task's solution file, returning "" when it is missing or unreadable"""
+    if not folder or not solution_file:
+        return ""
+    path = os.path.join(folder, solution_file)
+    try:
+        with tracing.span("read_code"):
+            if cached:
+                return source_cache.get_text(path).strip()
+            with course_source.open_text(path) as file:
+                code = file.read()
+            tracing.count("bytes_read", len(code))
+            return code.strip()
+    except Exception:
+        return ""
+
+
+def task_code(level, task, cached=True):
+    """The task's code: its code_snippet if given, otherwise read from the solution file now"""
+    if task.get('code_snippet') is not None:
+        return task['code_snippet']
+    return read_code(level['folder'], task['solution_file'], cached)
+
+
+def lookahead(iterable):
+    """Yield (item, is_last) pairs, so lists and generators can be treated alike"""
+    iterator = iter(iterable)
+    try:
+        item = next(iterator)
+    except StopIteration:
+        return
+    for following in iterator:
+        yield item, False
+        item = following
+    yield item, True
+
+
+def build_report_data(course_root, skill_name, user_name="", user_role="", rules=None):
+    """Scan a course (one root or a list) and build report_data the same way Auto-Import + Generate does
+
+    Tasks carry no code_snippet; the renderer reads each solution file when it gets to it.
+    """
+    levels = course_scanner.scan_course(course_root, rules=rules)
+    return {
+        "skill_name": skill_name,
+        "user_name": user_name,
+        "user_role": user_role,
+        "levels": levels,
+    }
+
+
+def stream_report_data(course_root, skill_name, user_name="", user_role="", rules=None):
+    """Like build_report_data, but levels and their tasks are generators read as rendering reaches them
+
+    For ReportOptions(stream=True); "level_count" stands in for len(levels).
+    """
+    day_folders = course_scanner.find_day_folders(course_root, rules)
+    return {
+        "skill_name": skill_name,
+        "user_name": user_name,
+        "user_role": user_role,
+        "level_count": len(day_folders),
+        "levels": course_scanner.iter_levels(day_folders, rules),
+    }
+
+
+class ReportRenderer:
+    """Lays report content out top-to-bottom on a ReportLab canvas, breaking pages as needed"""
+
+    def __init__(self, c, styles, options, progress_callback=None, measure_only=False, paragraph_cache=None):
+        self.c = c
+        self.styles = styles
+        self.options = options
+        self.measure_only = measure_only  # Layout pass: track positions, draw nothing
+        self.paragraph_cache = {} if paragraph_cache is None else paragraph_cache  # (text, style, width) -> (p, height)
+        self.navigation = options.table_of_contents or options.outline
+        self.marks = []  # (key, title, outline level, page) of every heading, from measuring passes
+        self.level_index = 0
+        self.image_preparer = options.image_preparer()
+        self.pipeline = None  # TaskPipeline while prefetch() is on
+        self.progress_callback = progress_callback
+        self.page_width, self.page_height = letter
+        self.left_margin = self.bottom_margin = inch
+        self.y_position = PAGE_TOP
+
+    def new_page(self):
+        self.c.showPage()
+        self.y_position = PAGE_TOP
+
+    def wrap_paragraph(self, text, style):
+        """Wrapped Paragraph and its height, measured once per (text, style, width)"""
+        width = self.page_width - 2 * inch
+        key = (text, style.name, width)
+        cached = self.paragraph_cache.get(key)
+        if cached is not None:
+            return cached
+        p = Paragraph(text, style)
+        with tracing.span("wrapOn"):
+            height = p.wrapOn(self.c, width, self.page_height)[1]
+        tracing.count("paragraphs")
+        if len(self.paragraph_cache) < PARAGRAPH_CACHE_SIZE:
+            self.paragraph_cache[key] = (p, height)
+        return p, height
+
+    def draw_paragraph(self, text, style=None, leading=None, bookmark=None):
+        style = style or self.styles["normal"]
+        p, height = self.wrap_paragraph(text, style)
+        if self.y_position - height < inch:
+            self.new_page()
+        if bookmark is not None:
+            self.add_bookmark(*bookmark)
+        if not self.measure_only:
+            p.drawOn(self.c, inch, self.y_position - height)
+        self.y_position -= height + (leading if leading is not None else style.leading)
+
+    def prepare_image(self, img_path):
+        # Downsample to the printed size, keeping the aspect ratio and a full page at most
+        if self.measure_only:
+            width, height = self.image_preparer.measure(img_path, *IMAGE_BOX)
+            return PreparedImage(None, width, height)
+        with tracing.span("prepare_image"):
+            return self.image_preparer.prepare(img_path, *IMAGE_BOX)
+
+    def draw_image(self, img_path, image=None):
+        if image is None:
+            image = self.prepare_image(img_path)
+
+        if self.y_position - image.height < inch:
+            self.new_page()
+
+        # drawImage registers one XObject per file name; content-addressed paths make
+        # repeated screenshots and the placeholder reference that single copy
+        with tracing.span("drawImage"):
+            self.c.drawImage(image.path, inch, self.y_position - image.height - IMAGE_OFFSET, image.width, image.height)
+        self.y_position -= (image.height + 0.5 * inch)  # Increased space after image (0.5 inch)
+
+    def add_bookmark(self, key, title, level):
+        """Mark a heading about to be drawn at the current position, for the TOC and outline"""
+        if self.measure_only:
+            self.marks.append((key, title, level, self.c.getPageNumber()))
+        elif self.navigation:
+            self.c.bookmarkHorizontal(key, 0, self.y_position)
+            if self.options.outline:
+                self.c.addOutlineEntry(title[:OUTLINE_TITLE_CHARS], key, level)
+
+    def report_progress(self, fraction, message):
+        if self.progress_callback:
+            self.progress_callback(fraction, message)
+
+    def render_header(self, report_data):
+        self.draw_paragraph(f"Skill {escape(report_data['skill_name'])} Report", self.styles["header"], leading=14)
+        self.draw_paragraph("", leading=4)
+
+    def render_level(self, level, i, level_count):
+        with tracing.span("level", level=i + 1):
+            self.draw_level(level, i, level_count)
+
+    def draw_level(self, level, i, level_count):
+        styles = self.styles
+        # Process folder path to show only last 3 directories
+        folder_path = level['folder']
+        path_parts = folder_path.replace('\\', '/').split('/')
+        shortened_path = '/'.join(path_parts[-3:]) if len(path_parts) >= 3 else folder_path
+
+        self.level_index = i
+        self.draw_paragraph(
+            f"Level {i + 1}: {escape(level['level_name'])}", styles["level"],
+            bookmark=(f"level-{i + 1}", f"Level {i + 1}: {level['level_name']}", 0)
+        )
+        self.draw_paragraph(f"Folder: {escape(shortened_path)}", styles["normal"], leading=styles["normal"].fontSize * 1.2)
+        self.draw_paragraph("", leading=2)
+
+        tasks = level['tasks']
+        task_count = len(tasks) if hasattr(tasks, '__len__') else None  # None: a generator
+        loaded_tasks = self.pipeline.tasks_of(i) if self.pipeline else self.load_tasks(level, tasks)
+        for j, ((task, loaded, counters), is_last) in enumerate(lookahead(loaded_tasks)):
+            self.render_task(task, loaded, j, is_last, counters)
+            if task_count:
+                self.report_progress(
+                    (i + (j + 1) / task_count) / level_count,
+                    f"Level {i + 1}/{level_count}: task {j + 1}/{task_count}"
+                )
+            else:
+                self.report_progress(i / level_count, f"Level {i + 1}/{level_count}: task {j + 1}")
+
+        # VERY BIG SPACE BETWEEN LEVELS - 1.5 inches (108 points)
+        if i < level_count - 1:  # Don't add after last level
+            self.render_level_separator()
+
+    def task_code(self, level, task):
+        return task_code(level, task)
+
+    def load_task(self, level, task):
+        """Everything a task needs from disk: (code, prepared image, error preparing the image)
+
+        Runs on prefetch threads, so it must not touch the canvas or the layout state.
+        """
+        code = self.task_code(level, task)
+        try:
+            # Shared placeholder file, so the PDF carries a single copy of it
+            return code, self.prepare_image(task['image_path'] or placeholder_image_path()), None
+        except Exception as e:
+            return code, None, e
+
+    def load_task_counted(self, level, task):
+        """(load_task result, the trace counters loading it recorded), whichever thread it runs on"""
+        with tracing.collect() as counters:
+            loaded = self.load_task(level, task)
+        return loaded, counters.args
+
+    def load_tasks(self, level, tasks):
+        """Yield (task, load_task result, its trace counters) in order, loading each as it is reached"""
+        for task in tasks:
+            yield (task, *self.load_task_counted(level, task))
+
+    def prefetch(self, levels):
+        """Start loading the tasks of levels, (i, level) pairs in drawing order, prefetch_depth tasks ahead
+
+        One pool serves every level, so the next level's first tasks load while the
+        current level's last ones are laid out. Call close() once drawing is done.
+        """
+        depth = self.options.prefetch_depth
+        if depth and not self.measure_only:
+            self.pipeline = TaskPipeline(self.load_task_counted, levels, depth)
+
+    def close(self):
+        if self.pipeline:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def render_task(self, task, loaded, j, is_last, counters=None):
+        with tracing.span("task", task=j + 1):
+            tracing.add(counters)  # Bytes read and pixels decoded loading it, wherever that ran
+            self.draw_task(task, j, is_last, *loaded)
+
+    def draw_task(self, task, j, is_last, code, image, image_error):
+        styles = self.styles
+        self.draw_paragraph(
+            f"[{j + 1}] Task: {escape(task['task'])}", styles["solution"],
+            bookmark=(f"level-{self.level_index + 1}-task-{j + 1}", f"[{j + 1}] {task['task']}", 1)
+        )
+        self.draw_paragraph(f"Solution File: {escape(task['solution_file'])}", styles["normal"])
+
+        if code:
+            self.draw_paragraph("Code:", styles["normal"])
+            draw_code_block(
+                self, code, styles["code"],
+                line_numbers=self.options.code_line_numbers, wrap=self.options.code_wrap
+            )
+
+        # Always include an image - either the selected one or a placeholder
+        try:
+            if image_error is not None:
+                raise image_error
+            self.draw_image(image.path, image)
+
+            # Add extra blank space after image
+            self.draw_paragraph("", leading=12)
+
+            # Add a task separator line (thinner than level separator)
+            if not is_last:  # Don't add after last task in level
+                self.c.setLineWidth(0.5)  # Thin line
+                self.c.setStrokeColorRGB(0.7, 0.7, 0.7)  # Light gray
+                self.c.line(inch * 1.5, self.y_position - 6, self.page_width - inch * 1.5, self.y_position - 6)
+                self.y_position -= 24  # Space after line
+
+        except Exception as e:
+            self.draw_paragraph(f"Error embedding image: {e}")
+
+        # Add significant space between tasks
+        self.draw_paragraph("", leading=24)  # 24 points space between tasks
+
+    def render_level_separator(self):
+        self.y_position -= 1.5 * inch
+        if self.y_position < inch:  # If we're too close to bottom
+            self.new_page()
+
+        # Visual separator line between levels
+        self.c.setLineWidth(2.0)  # Thicker line
+        self.c.setStrokeColorRGB(0.7, 0.7, 0.7)  # Light gray
+        self.c.line(inch, self.y_position, self.page_width - inch, self.y_position)
+
+        self.y_position -= 0.25 * inch  # Space after line
+
+        self.draw_paragraph("→ Next Level →", self.styles["separator"], leading=12)
+
+    def render_user_info(self, report_data):
+        user_info = []
+        if report_data.get('user_name'):
+            user_info.append(f"<b>Name :</b> {escape(report_data['user_name'])}")
+        if report_data.get('user_role'):
+            user_info.append(f"<b>Role:</b> {escape(report_data['user_role'])}")
+        if user_info:
+            self.draw_paragraph("<br/>".join(user_info), self.styles["user"])
+
+
+class TaskPipeline:
+    """Loads the tasks of a series of levels in order on one thread pool, depth tasks ahead
+
+    Disk reads and image decoding for the next tasks then overlap with laying out the
+    current one, across level boundaries, while only the calling thread draws on the canvas.
+    """
+
+    def __init__(self, load, levels, depth):
+        self.load = load  # load(level, task), run on the pool's threads
+        self.depth = depth
+        self.tasks = ((i, level, task) for i, level in levels for task in level['tasks'])
+        self.pending = deque()  # (i, task, future) in drawing order
+        self.pool = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="prefetch")
+        self.fill()
+
+    def fill(self):
+        while self.tasks is not None and len(self.pending) <= self.depth:
+            item = next(self.tasks, None)
+            if item is None:
+                self.tasks = None
+                break
+            i, level, task = item
+            self.pending.append((i, task, self.pool.submit(self.load, level, task)))
+
+    def tasks_of(self, i):
+        """Yield (task, load result, its trace counters) for level i, whose tasks must be next"""
+        while self.pending and self.pending[0][0] == i:
+            _, task, future = self.pending.popleft()
+            self.fill()
+            yield (task, *future.result())
+
+    def close(self):
+        for _, _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.tasks = None
+        self.pool.shutdown()
+
+
+def segment_levels(segments):
+    """(i, level) of every level segment, in order"""
+    for segment in segments:
+        if segment.kind == "level":
+            level, i, _ = segment.data
+            yield i, level
+
+
+class Segment:
+    """An independently renderable part of the report: the header, one level, or the user info
+
+    Segments are plain picklable data, so they can be sent to worker processes. draw(renderer)
+    lays the segment out from the renderer's current position; describe(image_preparer)
+    returns JSON-able data covering everything it depends on, for render caches.
+    """
+
+    def __init__(self, kind, data, name, fraction):
+        self.kind = kind  # "header", "level" or "user"
+        self.data = data  # (level, i, level_count) for levels, a small report_data dict otherwise
+        self.name = name
+        self.fraction = fraction  # Progress once this segment is done
+
+    def draw(self, renderer):
+        if self.kind == "level":
+            renderer.render_level(*self.data)
+        elif self.kind == "header":
+            renderer.render_header(self.data)
+        else:
+            renderer.render_user_info(self.data)
+
+    def describe(self, image_preparer):
+        if self.kind == "level":
+            return describe_level(*self.data, image_preparer)
+        return {self.kind: self.data}
+
+    def weight(self):
+        """Rough rendering cost, for splitting work into balanced groups"""
+        return 1 + (len(self.data[0]['tasks']) if self.kind == "level" else 0)
+
+
+def image_signature(image_path, image_preparer):
+    """Content hash of the prepared image (prepared files are content-addressed)"""
+    try:
+        prepared = image_preparer.prepare(image_path or placeholder_image_path(), *IMAGE_BOX)
+        return os.path.basename(prepared.path)
+    except Exception as e:
+        return f"error: {e}"
+
+
+def describe_level(level, i, level_count, image_preparer):
+    tasks = []
+    for task in level['tasks']:
+        code = task_code(level, task)
+        tasks.append([
+            task['task'], task['solution_file'],
+            hashlib.sha1(code.encode("utf-8")).hexdigest(),
+            image_signature(task['image_path'], image_preparer),
+        ])
+    return {
+        "index": i,
+        "last": i == level_count - 1,
+        "level_name": level['level_name'],
+        "folder": level['folder'],
+        "tasks": tasks,
+    }
+
+
+def report_segments(report_data):
+    """Split the report into the Segments that, drawn in order, make up the whole PDF"""
+    levels = report_data["levels"]
+    level_count = len(levels)
+    segments = [Segment("header", {"skill_name": report_data['skill_name']}, "Header", 0.0)]
+    for i, level in enumerate(levels):
+        segments.append(Segment("level", (level, i, level_count), f"Level {i + 1}/{level_count}", (i + 1) / level_count))
+    segments.append(Segment(
+        "user", {"user_name": report_data.get('user_name'), "user_role": report_data.get('user_role')}, "User info", 1.0
+    ))
+    return segments
+
+
+class MeasuringCanvas:
+    """Stands in for a Canvas during layout-only passes: counts pages and draws nothing"""
+
+    def __init__(self):
+        self.page_number = 1
+
+    def showPage(self):
+        self.page_number += 1
+
+    def getPageNumber(self):
+        return self.page_number
+
+    def beginText(self, *args, **kwargs):
+        return self  # Text object calls are ignored too
+
+    def __getattr__(self, name):
+        return _ignore
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+def measure_segments(segments, options):
+    """Cheap layout pass: (start_y, start_page) of every segment, without drawing or preparing images"""
+    renderer = ReportRenderer(MeasuringCanvas(), report_styles(), options, measure_only=True)
+    positions = []
+    for segment in segments:
+        positions.append((renderer.y_position, renderer.c.getPageNumber()))
+        segment.draw(renderer)
+    return positions
+
+
+def render_fragment(path, start_y, segments, options, progress_callback=None):
+    """Draw segments on a fresh canvas starting at start_y; returns (end_y, page_count)"""
+    c = canvas.Canvas(path, pagesize=letter)
+    renderer = ReportRenderer(c, report_styles(), options, progress_callback)
+    renderer.y_position = start_y
+    renderer.prefetch(segment_levels(segments))
+    try:
+        for segment in segments:
+            segment.draw(renderer)
+    finally:
+        renderer.close()
+    pages = c.getPageNumber()
+    with tracing.span("canvas_save"):
+        c.save()
+    return renderer.y_position, pages
+
+
+def fit_text(text, font_name, font_size, width):
+    """text, shortened with an ellipsis if it is wider than width"""
+    if stringWidth(text, font_name, font_size) <= width:
+        return text
+    while text and stringWidth(text + "…", font_name, font_size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def toc_layout(marks):
+    """Table of contents lines split into pages: a list of [(mark, y), ...] per page"""
+    pages, page = [], []
+    y = PAGE_TOP - TOC_TITLE_SPACE
+    for mark in marks:
+        if y < inch:
+            pages.append(page)
+            page, y = [], PAGE_TOP
+        page.append((mark, y))
+        y -= TOC_LEADING
+    pages.append(page)
+    return pages
+
+
+def draw_table_of_contents(c, marks):
+    """Draw the contents pages, linking each line to its heading; returns the number of pages"""
+    pages = toc_layout(marks)
+    right = letter[0] - inch
+    for k, page in enumerate(pages):
+        if k == 0:
+            c.setFont("Helvetica-Bold", 18)
+            c.drawString(inch, PAGE_TOP - 18, "Contents")
+        for (key, title, level, body_page), y in page:
+            font_name, font_size = ("Helvetica-Bold", 11) if level == 0 else ("Helvetica", 10)
+            left = inch + level * 18
+            number = str(body_page + len(pages))
+            c.setFont(font_name, font_size)
+            available = right - left - stringWidth(number, font_name, font_size) - 12
+            c.drawString(left, y, fit_text(title, font_name, font_size, available))
+            c.drawRightString(right, y, number)
+            c.linkRect("", key, (left, y - 3, right, y + font_size), relative=0)
+        c.showPage()
+    return len(pages)
+
+
+def render_serial(segments, full_path, title, options, progress_callback=None):
+    """Draw every segment on a single canvas
+
+    With a table of contents, a measuring pass first finds the page of every heading;
+    the paragraphs it wraps are reused by the drawing pass.
+    """
+    c = canvas.Canvas(full_path, pagesize=letter)
+    c.setTitle(title)
+    paragraph_cache = {}
+    if options.table_of_contents:
+        with tracing.span("measure_pass"):
+            measurer = ReportRenderer(MeasuringCanvas(), report_styles(), options, measure_only=True,
+                                      paragraph_cache=paragraph_cache)
+            for segment in segments:
+                segment.draw(measurer)
+        draw_table_of_contents(c, measurer.marks)
+    if options.outline:
+        c.showOutline()
+
+    renderer = ReportRenderer(c, report_styles(), options, progress_callback, paragraph_cache=paragraph_cache)
+    renderer.prefetch(segment_levels(segments))
+    try:
+        for segment in segments:
+            segment.draw(renderer)
+    finally:
+        renderer.close()
+    with tracing.span("canvas_save"):
+        c.save()
+
+
+def generate_pdf_report(report_data, save_path, progress_callback=None, options=None):
+    """Render report_data to Skill_<name>_Report.pdf inside save_path and return the file path
+
+    progress_callback, if given, is called as progress_callback(fraction, message) with
+    fraction in [0, 1]. options is a ReportOptions. Errors are raised to the caller.
+    """
+    options = options or ReportOptions()
+    if (options.table_of_contents or options.outline) and (
+            options.stream or options.incremental or options.parallel_workers):
+        raise ValueError("A table of contents and outline need the single-canvas renderer; "
+                         "they can't be combined with streaming, incremental or parallel rendering")
+    os.makedirs(save_path, exist_ok=True)
+    full_path = os.path.join(save_path, report_filename(report_data['skill_name']))
+    title = f"Skill {report_data['skill_name']} Report"
+
+    if progress_callback:
+        progress_callback(0.0, "Starting")
+
+    with tracing.span("generate_pdf_report", skill=report_data['skill_name']):
+        if options.stream:
+            import streaming
+            streaming.render_streaming(report_data, full_path, title, options, progress_callback)
+        elif options.incremental:
+            import render_cache
+            render_cache.render_incremental(
+                report_segments(report_data), full_path, title, options, PAGE_TOP,
+                lambda path, start_y, segment: render_fragment(path, start_y, [segment], options, progress_callback),
+                progress_callback,
+            )
+        elif options.parallel_workers and len(report_data["levels"]) > 1:
+            import parallel_render
+            segments = report_segments(report_data)
+            if not parallel_render.render_parallel(segments, full_path, title, options, progress_callback):
+                render_serial(segments, full_path, title, options, progress_callback)
+        else:
+            render_serial(report_segments(report_data), full_path, title, options, progress_callback)
+
+    if progress_callback:
+        progress_callback(1.0, "Done")
+    return full_path
+
+
+def print_progress(fraction, message):
+    print(f"[{fraction * 100:5.1f}%] {message}", file=sys.stderr)
+
+
+def add_option_arguments(parser):
+    """Add the ReportOptions flags shared by every command line entry point"""
+    parser.add_argument("--image-dpi", type=int, default=150, help="Resolution screenshots are downsampled to")
+    parser.add_argument("--image-format", default="JPEG", choices=IMAGE_FORMATS, type=str.upper,
+                        help="Re-encode screenshots as JPEG or flattened PNG")
+    parser.add_argument("--image-quality", type=int, default=85, help="JPEG quality (1-95)")
+    parser.add_argument("--image-cache", default=None, help="Folder for prepared screenshots (default: temp dir)")
+    parser.add_argument("--line-numbers", action="store_true", help="Number the lines of code blocks")
+    parser.add_argument("--no-wrap", action="store_true", help="Cut long code lines instead of wrapping them")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Cache each level next to the PDF and re-render only levels that changed")
+    parser.add_argument("--prefetch", type=int, default=4, metavar="DEPTH",
+                        help="Load the code and screenshots of the next DEPTH tasks in the background (0: off)")
+    parser.add_argument("--toc", action="store_true", help="Start with a linked table of contents")
+    parser.add_argument("--outline", action="store_true", help="Add PDF bookmarks for every level and task")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read tasks as they are reached and flush finished pages to disk to cap memory use")
+    parser.add_argument("--memory-limit", type=int, default=64, metavar="MB",
+                        help="With --stream: image and code data to hold before flushing pages (default: 64)")
+    parser.add_argument("--parallel", type=int, nargs="?", const=os.cpu_count() or 1, default=0, metavar="WORKERS",
+                        help="Render groups of levels in WORKERS processes (default: CPU count) and merge them")
+
+
+def options_from_args(args):
+    return ReportOptions(
+        image_dpi=args.image_dpi,
+        image_format=args.image_format,
+        image_quality=args.image_quality,
+        image_cache_dir=args.image_cache,
+        code_line_numbers=args.line_numbers,
+        code_wrap=not args.no_wrap,
+        incremental=args.incremental,
+        parallel_workers=args.parallel,
+        stream=args.stream,
+        memory_limit_mb=args.memory_limit,
+        table_of_contents=args.toc,
+        outline=args.outline,
+        prefetch_depth=args.prefetch,
+    )
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m report_engine",
+        description="Generate a Skill Report PDF without the GUI."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--course", nargs="+", metavar="ROOT",
+                        help="Course folder(s), .zip or .tar.gz containing Day folders, read in the order given")
+    source.add_argument("--data", help="JSON file with report_data (as built by the GUI)")
+    source.add_argument("--project", help=f"Project file saved by the GUI ({project.EXTENSION})")
+    parser.add_argument("--discovery", metavar="FILE",
+                        help=f"{discovery.CONFIG_NAME} with the level, task and screenshot patterns to use with --course")
+    parser.add_argument("--skill", help="Skill name (required with --course)")
+    parser.add_argument("--name", default="", help="Your name")
+    parser.add_argument("--role", default="", help="Your role")
+    parser.add_argument("--output", default=None,
+                        help="Folder to write the PDF to (default: the project's save location, else the current folder)")
+    parser.add_argument("--quiet", action="store_true", help="Don't print progress")
+    parser.add_argument("--trace", metavar="FILE",
+                        help=f"Record phase timings as a Chrome trace in FILE and print a summary (or set {tracing.ENV_VAR}=FILE)")
+    add_option_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.trace:
+        tracing.enable()
+    if (args.toc or args.outline) and (args.stream or args.incremental or args.parallel):
+        parser.error("--toc and --outline can't be combined with --stream, --incremental or --parallel")
+
+    if args.course:
+        if not args.skill:
+            parser.error("--skill is required with --course")
+        rules = None
+        if args.discovery:
+            try:
+                rules = discovery.load_config(args.discovery)[1]
+            except (OSError, ValueError) as e:
+                parser.error(f"--discovery: {e}")
+        build = stream_report_data if args.stream else build_report_data
+        report_data = build(args.course, args.skill, args.name, args.role, rules)
+    elif args.project:
+        saved = project.load_project(args.project)
+        stale = project.stale_references(saved)
+        if stale:
+            print(f"Warning: {project.describe_stale(stale)}", file=sys.stderr)
+        report_data = project.report_data_from_project(saved)
+        for key, value in (("skill_name", args.skill), ("user_name", args.name), ("user_role", args.role)):
+            if value:
+                report_data[key] = value
+        if not report_data.get("skill_name"):
+            parser.error("project has no skill name; pass --skill")
+        args.output = args.output or saved.get("save_location")
+    else:
+        with open(args.data, 'r', encoding='utf-8') as f:
+            report_data = json.load(f)
+        if args.skill:
+            report_data["skill_name"] = args.skill
+        if not report_data.get("skill_name"):
+            parser.error("report data has no skill_name; pass --skill")
+
+    if not report_data.get("level_count", report_data.get("levels")):
+        print("No levels to report", file=sys.stderr)
+        return 1
+
+    full_path = generate_pdf_report(
+        report_data, args.output or os.getcwd(), None if args.quiet else print_progress, options_from_args(args)
+    )
+    if args.trace:
+        tracing.export(args.trace)
+    print(full_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Process-wide registry of shared, lazily built resources.
+
+The placeholder image, its Tk thumbnail and the ReportLab paragraph styles are
+identical for every task and every report, so they are built once on first use
+and shared from then on. Nothing here imports tkinter or reportlab until the
+matching resource is actually requested; PIL is imported on first use too.
+"""
+import functools
+import hashlib
+import io
+import os
+import tempfile
+
+PREVIEW_SIZE = (100, 100)
+
+
+def create_empty_image():
+    """Create a small black rectangle image as placeholder"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', PREVIEW_SIZE, color='black')
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([10, 10, 90, 90], outline='white', width=2)
+    draw.text((50, 50), "No Image", fill='white', anchor='mm')
+    return img
+
+
+@functools.lru_cache(maxsize=None)
+def placeholder_image():
+    """Shared placeholder PIL image; treat it as read-only"""
+    return create_empty_image()
+
+
+@functools.lru_cache(maxsize=None)
+def placeholder_png():
+    buffer = io.BytesIO()
+    placeholder_image().save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def placeholder_image_path():
+    """Path of the placeholder PNG, written once and named by its content hash"""
+    data = placeholder_png()
+    path = os.path.join(tempfile.gettempdir(), f"report_maker_placeholder_{hashlib.sha1(data).hexdigest()[:16]}.png")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def placeholder_photo():
+    """Shared Tk PhotoImage of the placeholder; needs a Tk root to exist"""
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(placeholder_image())
+
+
+@functools.lru_cache(maxsize=None)
+def report_styles():
+    """ReportLab paragraph styles used by the report, keyed by role"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    normal_style = styles['Normal']
+    header_style = styles['h1']
+    level_style = styles['h2']
+    task_style = styles['h3']
+    solution_style = ParagraphStyle(
+        name='SolutionStyle',
+        parent=normal_style,
+        fontName='Helvetica-Bold',
+        fontSize=10,
+        leading=12
+    )
+
+    # Improved code style with better formatting
+    code_style = ParagraphStyle(
+        name='CodeStyle',
+        parent=normal_style,
+        fontName='Courier',
+        fontSize=10,
+        leading=12,
+        backColor="#f0f0f0",
+        leftIndent=20,
+        rightIndent=20,
+        spaceBefore=6,
+        spaceAfter=6
+    )
+
+    user_style = ParagraphStyle(
+        name='UserInfoStyle',
+        parent=normal_style,
+        fontSize=12,
+        leading=14,
+        spaceAfter=12
+    )
+
+    separator_style = ParagraphStyle(
+        name='Separator',
+        parent=normal_style,
+        fontName='Helvetica-Bold',
+        fontSize=12,
+        textColor='#888888',
+        alignment=1  # Center aligned
+    )
+
+    # Adjust spacing
+    header_style.spaceAfter = 10
+    level_style.spaceAfter = 5
+    task_style.spaceAfter = 3
+    normal_style.spaceAfter = 2
+    solution_style.spaceAfter = 2
+
+    return {
+        "normal": normal_style,
+        "header": header_style,
+        "level": level_style,
+        "task": task_style,
+        "solution": solution_style,
+        "code": code_style,
+        "user": user_style,
+        "separator": separator_style,
+    }
@@ -0,0 +1,186 @@
+"""In-memory full-text search over tasks: questions, solution file names and code.
+
+SearchIndex is an inverted index (token -> {task key: weight}) plus, per task,
+the tokens each field contributed, so replacing one field of one task only
+touches the postings of tokens that changed. A token's weight is the sum of the
+weights of the fields it appears in, and a query's words must all match,
+each as a prefix of a token once it is three characters long ("recur" finds
+"recursion"); a match in the question outranks one in the file name, which
+outranks one in the code.
+
+TaskIndexer keeps an index in step with the GUI's task records on a background
+thread: it reads solution files itself and skips tasks whose question, file and
+file mtime/size are unchanged, so re-submitting a whole level after an edit or
+a re-import costs a stat() per untouched task.
+"""
+import bisect
+import heapq
+import re
+import threading
+from collections import OrderedDict
+
+import course_source
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')  # Underscores split words: fib_recursive -> fib, recursive
+FIELD_WEIGHTS = {"task": 8, "solution_file": 4, "code": 1}
+MIN_PREFIX = 3  # Shorter query words must match a whole token
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = {}  # token -> {key: weight}
+        self.documents = {}  # key -> {field: tuple of its distinct tokens}
+        self._vocabulary = None  # Sorted tokens for prefix lookups, rebuilt after the token set changes
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def update(self, key, fields):
+        """Set some fields ({field: text}) of document key; fields not given keep their tokens"""
+        new_fields = {field: set(tokenize(text or "")) for field, text in fields.items()}  # Outside the lock
+        with self.lock:
+            document = self.documents.setdefault(key, {})
+            for field, tokens in new_fields.items():
+                old = set(document.get(field, ()))
+                weight = FIELD_WEIGHTS[field]
+                for token in old - tokens:
+                    self._add_weight(token, key, -weight)
+                for token in tokens - old:
+                    self._add_weight(token, key, weight)
+                document[field] = tuple(tokens)  # A tuple costs a fraction of a set per token
+
+    def remove(self, key):
+        with self.lock:
+            document = self.documents.pop(key, None)
+            if document is None:
+                return
+            for field, tokens in document.items():
+                for token in tokens:
+                    self._add_weight(token, key, -FIELD_WEIGHTS[field])
+
+    def _add_weight(self, token, key, delta):
+        posting = self.postings.get(token)
+        if posting is None:
+            posting = self.postings[token] = {}
+            self._vocabulary = None
+        weight = posting.get(key, 0) + delta
+        if weight:
+            posting[key] = weight
+        else:
+            del posting[key]
+            if not posting:
+                del self.postings[token]
+                self._vocabulary = None
+
+    def matching_tokens(self, word):
+        """Every indexed token word is a prefix of (just word itself when it is short)"""
+        if len(word) < MIN_PREFIX:
+            return [word] if word in self.postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, word)
+        end = bisect.bisect_left(self._vocabulary, word + "\uffff", start)
+        return self._vocabulary[start:end]
+
+    def search(self, query, limit=20):
+        """(score, key) of the best documents matching every word of query, best first"""
+        words = sorted(set(tokenize(query)), key=len, reverse=True)  # Longer words are usually rarer
+        if not words:
+            return []
+        with self.lock:
+            scores = None
+            for word in words:
+                matches = {}
+                for token in self.matching_tokens(word):
+                    for key, weight in self.postings[token].items():
+                        if scores is None or key in scores:
+                            matches[key] = matches.get(key, 0) + weight
+                if scores is not None:
+                    for key, score in matches.items():
+                        matches[key] = score + scores[key]
+                scores = matches
+                if not scores:
+                    return []
+        return heapq.nlargest(limit, ((score, key) for key, score in scores.items()), key=lambda item: item[0])
+
+
+def read_code(path):
+    """Solution file text for indexing, or "" when it can't be read"""
+    try:
+        with course_source.open_text(path) as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+class TaskIndexer:
+    """Feeds task changes into a SearchIndex on a background thread; the latest change per key wins"""
+
+    def __init__(self, index=None):
+        self.index = index if index is not None else SearchIndex()
+        self.pending = OrderedDict()  # key -> (question, solution file, code path), or None to remove
+        self.indexed = {}  # key -> (question, solution file, code path, mtime_ns, size) last indexed
+        self.condition = threading.Condition()
+        self.worker = None
+
+    def submit(self, key, question, solution_file, code_path):
+        """Queue a task for (re-)indexing; code_path is its solution file's full path, or None"""
+        self._queue(key, (question or "", solution_file or "", code_path))
+
+    def remove(self, key):
+        self._queue(key, None)
+
+    def _queue(self, key, item):
+        with self.condition:
+            self.pending[key] = item
+            self.pending.move_to_end(key)
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name="search-indexer", daemon=True)
+                self.worker.start()
+
+    def busy(self):
+        with self.condition:
+            return self.worker is not None
+
+    def wait(self, timeout=None):
+        """Block until everything queued so far is indexed (for scripts; the GUI polls busy())"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.worker is None, timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.pending:
+                    self.worker = None
+                    self.condition.notify_all()
+                    return
+                key, item = self.pending.popitem(last=False)
+            try:
+                self._apply(key, item)
+            except Exception as e:
+                print(f"Could not index task: {e}")
+
+    def _apply(self, key, item):
+        if item is None:
+            self.indexed.pop(key, None)
+            self.index.remove(key)
+            return
+        question, solution_file, code_path = item
+        try:
+            stat = course_source.stat(code_path) if code_path else None
+        except OSError:
+            stat = None
+        signature = item + ((stat.st_mtime_ns, stat.st_size) if stat else (None, None))
+        previous = self.indexed.get(key)
+        if previous == signature:
+            return
+        fields = {"task": question, "solution_file": solution_file}
+        if previous is None or previous[2:] != signature[2:]:
+            fields["code"] = read_code(code_path) if stat else ""
+        self.index.update(key, fields)
+        self.indexed[key] = signature
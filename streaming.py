@@ -0,0 +1,104 @@
+"""Bounded-memory report rendering for very large courses.
+
+A ReportLab canvas keeps every page and every embedded image in memory until
+save(). StreamingRenderer instead counts the image and code bytes the current
+canvas holds and, once they pass options.memory_limit_mb, saves it as a chunk
+at the next page break and carries on with a fresh canvas. Levels and tasks are
+consumed as iterators (see report_engine.stream_report_data) and code is read
+without the shared source cache, so nothing outlives the page it is printed on.
+The chunks, which always split on page boundaries, are joined at the end by
+pdf_merge.concatenate_fragments, which copies the already compressed pages to
+the output file one chunk at a time, so the join is bounded by the size of one
+chunk too. Requires pypdf.
+"""
+import itertools
+import os
+import shutil
+import tempfile
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import report_engine
+import tracing
+from pdf_merge import concatenate_fragments, require_pypdf
+from resources import report_styles
+
+
+class StreamingRenderer(report_engine.ReportRenderer):
+    """ReportRenderer that saves its canvas in chunks once it holds memory_limit bytes"""
+
+    def __init__(self, chunk_dir, options, progress_callback=None):
+        self.chunk_dir = chunk_dir
+        self.chunk_paths = []
+        self.memory_limit = options.memory_limit_mb * 1024 * 1024
+        self.peak_held_bytes = 0
+        super().__init__(self.open_chunk(), report_styles(), options, progress_callback)
+
+    def open_chunk(self):
+        path = os.path.join(self.chunk_dir, f"{len(self.chunk_paths):05d}.pdf")
+        self.chunk_paths.append(path)
+        self.held_bytes = 0
+        self.held_images = set()  # The canvas embeds each file once
+        return canvas.Canvas(path, pagesize=letter)
+
+    def hold(self, size):
+        self.held_bytes += size
+        self.peak_held_bytes = max(self.peak_held_bytes, self.held_bytes)
+
+    def new_page(self):
+        super().new_page()
+        if self.held_bytes >= self.memory_limit:
+            self.finish()
+            self.c = self.open_chunk()
+
+    def draw_image(self, img_path, image=None):
+        super().draw_image(img_path, image)
+        image = image or self.prepare_image(img_path)
+        if image.path not in self.held_images:
+            self.held_images.add(image.path)
+            self.hold(os.path.getsize(image.path))
+
+    def task_code(self, level, task):
+        # Called on prefetch threads; the code is counted when it is drawn
+        return report_engine.task_code(level, task, cached=False)
+
+    def draw_task(self, task, j, is_last, code, image, image_error):
+        self.hold(len(code))
+        super().draw_task(task, j, is_last, code, image, image_error)
+
+    def finish(self):
+        with tracing.span("canvas_save"):
+            self.c.save()
+
+
+def render_streaming(report_data, full_path, title, options, progress_callback=None):
+    """Render report_data to full_path in page chunks; returns the peak bytes held by one canvas
+
+    report_data["levels"], and each level's "tasks", may be any iterable. Pass
+    report_data["level_count"] when levels is not a list.
+    """
+    require_pypdf()
+    levels = report_data["levels"]
+    level_count = report_data.get("level_count") or len(levels)
+
+    chunk_dir = tempfile.mkdtemp(prefix=".chunks-", dir=os.path.dirname(full_path) or ".")
+    try:
+        renderer = StreamingRenderer(chunk_dir, options, progress_callback)
+        levels, prefetched = itertools.tee(levels)  # The pipeline reads a few levels ahead of drawing
+        renderer.prefetch(enumerate(prefetched))
+        try:
+            renderer.render_header(report_data)
+            for i, level in enumerate(levels):
+                renderer.render_level(level, i, level_count)
+            renderer.render_user_info(report_data)
+        finally:
+            renderer.close()
+        renderer.finish()
+
+        if progress_callback:
+            progress_callback(0.97, f"Joining {len(renderer.chunk_paths)} chunks")
+        concatenate_fragments(renderer.chunk_paths, full_path, title)
+        return renderer.peak_held_bytes
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
@@ -0,0 +1,114 @@
+"""Streaming mode keeps memory bounded, including the final join of its chunks.
+
+    python -m pytest test_streaming.py
+
+The course is built from noise screenshots, which don't compress, so every task
+holds a known, large amount of image data.
+"""
+import multiprocessing
+import os
+import random
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from PIL import Image
+
+import report_engine
+import streaming
+from benchmark import own_peak_rss_mb
+
+pytest.importorskip("pypdf")
+
+MEMORY_LIMIT_MB = 1
+TASKS_PER_DAY = 6
+SCREENSHOT_SIZE = (800, 500)
+
+
+def write_course(root, days, seed=1):
+    rng = random.Random(seed)
+    for day in range(1, days + 1):
+        folder = os.path.join(root, f"Day{day} [Noise {day}]")
+        os.makedirs(os.path.join(folder, "Screenshots"))
+        for task in range(1, TASKS_PER_DAY + 1):
+            with open(os.path.join(folder, f"{day}.{task}.py"), "w", encoding="utf-8") as f:
+                f.write(f"# Print task number {day}.{task}\nprint({day}, {task})\n")
+            width, height = SCREENSHOT_SIZE
+            image = Image.frombytes("RGB", SCREENSHOT_SIZE, rng.randbytes(width * height * 3))
+            image.save(os.path.join(folder, "Screenshots", f"{day}.{task}.png"))
+    return root
+
+
+def render(root, output, stream):
+    options = report_engine.ReportOptions(image_cache_dir=os.path.join(os.path.dirname(root), "image_cache"),
+                                          stream=stream, memory_limit_mb=MEMORY_LIMIT_MB)
+    build = report_engine.stream_report_data if stream else report_engine.build_report_data
+    return report_engine.generate_pdf_report(build(root, "Memory"), output, options=options)
+
+
+def render_peak_rss_mb(root, output, stream):
+    """Worker entry point: render in a fresh process and return its peak RSS"""
+    render(root, output, stream)
+    return own_peak_rss_mb()
+
+
+def peak_rss_mb(root, output, stream):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(render_peak_rss_mb, root, output, stream).result()
+
+
+@pytest.fixture(scope="module")
+def courses(tmp_path_factory):
+    """A small and a three times larger course, with their prepared screenshots already cached"""
+    base = tmp_path_factory.mktemp("courses")
+    small = write_course(str(base / "small"), days=2)
+    large = write_course(str(base / "large"), days=6)
+    for root in (small, large):
+        render(root, str(base / "warm"), stream=False)
+    return small, large, base
+
+
+def test_join_holds_one_chunk_at_a_time(courses, monkeypatch):
+    _, large, base = courses
+    joins = []
+
+    def traced_join(fragment_paths, output_path, title=None):
+        largest_chunk = max(os.path.getsize(path) for path in fragment_paths)
+        tracemalloc.start()
+        try:
+            pages = concatenate_fragments(fragment_paths, output_path, title)
+            joins.append((len(fragment_paths), largest_chunk, tracemalloc.get_traced_memory()[1]))
+        finally:
+            tracemalloc.stop()
+        return pages
+
+    concatenate_fragments = streaming.concatenate_fragments
+    monkeypatch.setattr(streaming, "concatenate_fragments", traced_join)
+    full_path = render(large, str(base / "join"), stream=True)
+
+    chunks, largest_chunk, join_peak = joins[0]
+    report_size = os.path.getsize(full_path)
+    assert chunks >= 4
+    assert join_peak < 3 * largest_chunk + 1024 * 1024
+    assert join_peak < report_size / 2
+
+
+def test_peak_memory_does_not_grow_with_the_course(courses):
+    if own_peak_rss_mb() is None:
+        pytest.skip("peak RSS is read from /proc")
+    small, large, base = courses
+    course_growth_mb = (
+        sum(os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(large) for name in names)
+        - sum(os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(small) for name in names)
+    ) / (1024 * 1024)
+
+    stream_small = peak_rss_mb(small, str(base / "stream_small"), stream=True)
+    stream_large = peak_rss_mb(large, str(base / "stream_large"), stream=True)
+    serial_small = peak_rss_mb(small, str(base / "serial_small"), stream=False)
+    serial_large = peak_rss_mb(large, str(base / "serial_large"), stream=False)
+
+    # A single canvas holds the whole report, so the test course is big enough to show it
+    assert serial_large - serial_small > 4 * MEMORY_LIMIT_MB
+    # Streaming stays within a few chunks of the small course's peak however much the course grows
+    assert stream_large - stream_small < 3 * MEMORY_LIMIT_MB, (stream_small, stream_large, course_growth_mb)
+    assert stream_large < serial_large
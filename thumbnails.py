@@ -0,0 +1,114 @@
+"""Off-thread screenshot thumbnails for the task previews.
+
+Thumbnails are decoded on a small worker pool (using JPEG draft mode and
+reduce-based resizing, so a large screenshot is never fully decoded at full
+size just to show 100x100 pixels) and written to an on-disk cache keyed by the
+image path and mtime. Finished thumbnails are handed back to the Tk thread by an
+after() poll, which is the only place PhotoImages are created.
+"""
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import course_source
+import resources
+import tracing
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "report_maker_thumbnails")
+POLL_MS = 30
+
+
+def thumbnail_cache_path(path, cache_dir, size=resources.PREVIEW_SIZE):
+    stat = course_source.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{size[0]}x{size[1]}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+
+def load_thumbnail(path, cache_dir, size=resources.PREVIEW_SIZE):
+    """Return a size-d PIL thumbnail of path, from the disk cache when possible"""
+    from PIL import Image
+
+    cache_path = thumbnail_cache_path(path, cache_dir, size)
+    try:
+        with Image.open(cache_path) as cached:
+            cached.load()
+            return cached.copy()
+    except OSError:
+        pass  # Not cached yet
+
+    with tracing.span("thumbnail"), course_source.open_binary(path) as f, Image.open(f) as img:
+        img.draft("RGB", size)  # JPEG: decode at 1/2, 1/4 or 1/8 scale
+        tracing.count("image_pixels", img.width * img.height)
+        thumb = img.convert("RGB").resize(size, reducing_gap=2.0)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        thumb.save(tmp_path, "PNG")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache thumbnail for {path}: {e}")
+    return thumb
+
+
+class ThumbnailLoader:
+    """Loads thumbnails on worker threads and delivers them to callbacks on the Tk thread"""
+
+    def __init__(self, widget, cache_dir=None, max_workers=4):
+        self.widget = widget
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR  # Created by the first thumbnail saved
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+
+    def request(self, path, callback):
+        """Load path's thumbnail and call callback(path, photo, error) on the Tk thread"""
+        self._pending += 1
+        self._pool.submit(self._work, path, callback)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_MS, self._drain)
+
+    def prefetch(self, paths):
+        """Warm the disk cache for paths without delivering anything"""
+        for path in paths:
+            self._pool.submit(self._warm, path)
+
+    def _warm(self, path):
+        try:
+            load_thumbnail(path, self.cache_dir)
+        except Exception:
+            pass  # Reported when the preview is actually requested
+
+    def _work(self, path, callback):
+        try:
+            self._results.put((path, callback, load_thumbnail(path, self.cache_dir), None))
+        except Exception as e:
+            self._results.put((path, callback, None, e))
+
+    def _drain(self):
+        from PIL import ImageTk
+
+        while True:
+            try:
+                path, callback, thumb, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            photo = ImageTk.PhotoImage(thumb) if thumb is not None else None
+            try:
+                callback(path, photo, error)
+            except Exception as e:
+                print(f"Error showing thumbnail for {path}: {e}")
+
+        if self._pending > 0:
+            self.widget.after(POLL_MS, self._drain)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,186 @@
+"""Lightweight phase tracing for import and report generation.
+
+Code marks its phases with ``with tracing.span("name"):`` and bumps counters
+with ``tracing.count("bytes_read", n)``; a counter is added to every open span
+on the same thread (so a task span holds what its image decode read), and to a
+process-wide total. Work done ahead of time, such as on a prefetch thread, runs
+inside ``with tracing.collect() as counters:`` and is credited to the spans open
+when its result is used with ``tracing.add(counters.args)``. Finished spans can be
+written as Chrome trace-event JSON (open in chrome://tracing or Perfetto) and
+summarised as text.
+
+Tracing is off unless enabled with tracing.enable(), the --trace flag, or the
+REPORT_TRACE environment variable (REPORT_TRACE=trace.json writes the trace
+and prints the summary when the process exits). When off, span() returns a
+shared no-op object and count() returns immediately.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import types
+from collections import defaultdict
+
+ENV_VAR = "REPORT_TRACE"
+
+_enabled = False
+_events = []
+_totals = defaultdict(int)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NullSpan:
+    args = types.MappingProxyType({})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    collects = False  # Counters stop here instead of reaching the spans it is nested in
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _local.stack.pop()
+        event = {
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start * 1e6,
+            "dur": (end - self.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        with _lock:
+            _events.append(event)
+        return False
+
+
+class Collector(Span):
+    """Holds the counters of work whose cost belongs to a span opened later; not a span in the trace"""
+
+    collects = True
+
+    def __exit__(self, *exc):
+        _local.stack.pop()
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    with _lock:
+        del _events[:]
+        _totals.clear()
+
+
+def span(name, **args):
+    """Context manager timing one phase; args are shown with the span in the trace"""
+    if not _enabled:
+        return NULL_SPAN
+    return Span(name, args)
+
+
+def collect():
+    """Context manager gathering the counters of the work inside it into its args, for add()"""
+    if not _enabled:
+        return NULL_SPAN
+    return Collector("collect", {})
+
+
+def count(name, value=1):
+    """Add value to counter name, on every open span (up to a collect()) and in the totals"""
+    if not _enabled:
+        return
+    _add_to_spans(name, value)
+    with _lock:
+        _totals[name] += value
+
+
+def add(counters):
+    """Credit counters gathered by collect() to the open spans; the totals already have them"""
+    if not _enabled or not counters:
+        return
+    for name, value in counters.items():
+        _add_to_spans(name, value)
+
+
+def _add_to_spans(name, value):
+    for span in reversed(getattr(_local, "stack", ())):
+        span.args[name] = span.args.get(name, 0) + value
+        if span.collects:
+            break
+
+
+def write_chrome_trace(path):
+    """Write every finished span as Chrome trace-event JSON"""
+    with _lock:
+        events = list(_events)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"counters": dict(_totals)}}, f)
+
+
+def summary():
+    """Per-phase call count and total/mean/max time, longest total first, then counter totals"""
+    with _lock:
+        events = list(_events)
+        totals = dict(_totals)
+    phases = defaultdict(list)
+    for event in events:
+        phases[event["name"]].append(event["dur"] / 1000)
+
+    lines = [f"{'phase':<28}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+    for name, durations in sorted(phases.items(), key=lambda item: -sum(item[1])):
+        lines.append(
+            f"{name:<28}{len(durations):>8}{sum(durations):>12.1f}"
+            f"{sum(durations) / len(durations):>10.2f}{max(durations):>10.2f}"
+        )
+    for name, value in sorted(totals.items()):
+        lines.append(f"{name}: {value:,}")
+    return "\n".join(lines)
+
+
+def export(path):
+    """Write the Chrome trace to path and print the text summary to stderr"""
+    write_chrome_trace(path)
+    print(summary(), file=sys.stderr)
+    print(f"Trace written to {path}", file=sys.stderr)
+
+
+if os.environ.get(ENV_VAR):
+    enable()
+    atexit.register(export, os.environ[ENV_VAR])